@@ -3,38 +3,49 @@
 Demo script showing the advanced features in action
 """
 
+import argparse
+import asyncio
 import os
 import sys
 import time
 from datetime import datetime, timedelta
 
-# Import modules directly
-sys.path.insert(0, 'src')
-import importlib.util
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-def import_module_from_file(module_name, file_path):
-    spec = importlib.util.spec_from_file_location(module_name, file_path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+from searxng_mcp.context_manager import InfiniteContextManager
+from searxng_mcp.rtd_manager import RealTimeDataManager
 
-context_manager = import_module_from_file('context_manager', 'src/searxng_mcp/context_manager.py')
-rtd_manager = import_module_from_file('rtd_manager', 'src/searxng_mcp/rtd_manager.py')
+# Multiplier for the demo's pacing pauses; DEMO_PACE=0 (or --pace 0) runs the
+# demo straight through so timings reflect the managers, not the animation
+PACE = float(os.environ.get("DEMO_PACE", "1.0"))
 
-InfiniteContextManager = context_manager.InfiniteContextManager
-RealTimeDataManager = rtd_manager.RealTimeDataManager
+
+def _pace(seconds):
+    """Sleep for a pacing pause scaled by PACE."""
+    if PACE:
+        time.sleep(seconds * PACE)
+
+
+def _pause(prompt):
+    """Wait for Enter, unless pacing is disabled."""
+    if PACE:
+        input(prompt)
 
 
 def clear_screen():
     """Clear the terminal screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    sys.stdout.write("\x1b[2J\x1b[H")
+    sys.stdout.flush()
+
+
+def emit(*lines):
+    """Write a block of lines to stdout in a single call."""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_header(title):
     """Print a fancy header."""
-    print("\n" + "=" * 70)
-    print(f"  {title}")
-    print("=" * 70 + "\n")
+    emit("\n" + "=" * 70, f"  {title}", "=" * 70 + "\n")
 
 
 def demo_context_manager():
@@ -42,11 +53,13 @@ def demo_context_manager():
     clear_screen()
     print_header("🧠 INFINITE CONTEXT MANAGER DEMO")
     
-    print("This demo shows how the Context Manager handles long conversations\n")
-    print("Simulating a research conversation about quantum computing...\n")
-    time.sleep(2)
+    emit(
+        "This demo shows how the Context Manager handles long conversations\n",
+        "Simulating a research conversation about quantum computing...\n",
+    )
+    _pace(2)
     
-    cm = InfiniteContextManager(recent_messages_limit=5, compression_threshold=8)
+    cm = InfiniteContextManager(recent_messages_limit=5, trigger_tokens=400, target_tokens=200)
     
     # Simulate a realistic conversation
     messages = [
@@ -72,46 +85,83 @@ def demo_context_manager():
         ("assistant", "Experts predict practical quantum computers for specific tasks within 5-10 years. Mainstream adoption for general computing may take 15-20 years as technology matures and costs decrease."),
     ]
     
+    # Ingest the whole conversation in one call so timing reflects the manager,
+    # not the print animation below
+    start = time.perf_counter()
+    cm.add_messages_bulk(messages)
+    ingest_ms = (time.perf_counter() - start) * 1000
+
+    lines = []
     for i, (role, content) in enumerate(messages, 1):
-        print(f"[{i}/20] {role.upper()}: {content[:70]}...")
-        cm.add_message(role, content)
-        time.sleep(0.3)
-    
-    print("\n" + "-" * 70)
-    print("💡 COMPRESSION IN ACTION")
-    print("-" * 70)
-    
+        lines.append(f"[{i}/{len(messages)}] {role.upper()}: {content[:70]}...")
+        if len(lines) == 5 or i == len(messages):
+            emit(*lines)
+            _pace(0.3 * len(lines))
+            lines = []
+
     stats = cm.get_stats()
     
-    print(f"\n📊 Statistics:")
-    print(f"   Total Messages:      {stats['total_messages']}")
-    print(f"   Recent (Full):       {stats['recent_messages']}")
-    print(f"   Compressed Blocks:   {stats['compressed_blocks']}")
-    print(f"   Key Facts Extracted: {stats['key_facts']}")
-    print(f"   Entities Tracked:    {stats['entities_tracked']}")
-    print(f"\n💾 Token Usage:")
-    print(f"   Original Tokens:     {stats['original_tokens']}")
-    print(f"   Current Tokens:      {stats['current_tokens']}")
-    print(f"   Compression Ratio:   {stats['compression_ratio']}%")
-    print(f"   Tokens Saved:        {stats['tokens_saved']}")
+    emit(
+        f"\n⚡ Ingested {len(messages)} messages in {ingest_ms:.2f} ms",
+        "\n" + "-" * 70,
+        "💡 COMPRESSION IN ACTION",
+        "-" * 70,
+        "\n📊 Statistics:",
+        f"   Total Messages:      {stats['total_messages']}",
+        f"   Recent (Full):       {stats['recent_messages']}",
+        f"   Compressed Blocks:   {stats['compressed_blocks']}",
+        f"   Key Facts Extracted: {stats['key_facts']}",
+        f"   Entities Tracked:    {stats['entities_tracked']}",
+        "\n🪟 Sliding Window:",
+        f"   Trigger Tokens:      {cm.trigger_tokens}",
+        f"   Target Tokens:       {cm.target_tokens}",
+        f"   Window Tokens:       {cm.token_count}",
+        "\n💾 Token Usage:",
+        f"   Original Tokens:     {stats['original_tokens']}",
+        f"   Current Tokens:      {stats['current_tokens']}",
+        f"   Fast Estimate:       {stats['fast_estimate']}",
+        f"   Compression Ratio:   {stats['compression_ratio']}%",
+        f"   Tokens Saved:        {stats['tokens_saved']}",
+    )
+
+    anchor = cm.get_anchor()
+
+    lines = [
+        "\n⚓ Anchor Summary (merged incrementally per compression):",
+        f"   Intent:              {anchor['intent']}",
+        f"   Facts:               {len(anchor['facts'])}",
+    ]
+    lines.extend(f"      • {fact[:70]}" for fact in anchor['facts'][:3])
+    lines.append(f"   Decisions:           {len(anchor['decisions'])}")
+    lines.extend(f"      • {decision[:70]}" for decision in anchor['decisions'][:3])
+    lines.append(f"   Entities:            {', '.join(list(anchor['entities'])[:5])}")
+    if anchor['next_steps']:
+        lines.append(f"   Open Questions:      {'; '.join(anchor['next_steps'])}")
     
     context = cm.get_context(max_tokens=500)
     
-    print(f"\n🎯 Optimized Context (500 token limit):")
-    print(f"   Compressed Summary:  {len(context.get('compressed_summary', ''))} chars")
-    print(f"   Key Facts:           {len(context.get('key_facts', []))} facts")
-    print(f"   Recent Messages:     {len(context.get('recent_messages', []))} messages")
+    lines.extend([
+        "\n🎯 Optimized Context (500 token limit):",
+        f"   Compressed Summary:  {len(context.get('compressed_summary', ''))} chars",
+        f"   Key Facts:           {len(context.get('key_facts', []))} facts",
+        f"   Recent Messages:     {len(context.get('recent_messages', []))} messages",
+    ])
     
     if context.get('top_entities'):
-        print(f"\n🔍 Top Entities:")
-        for entity in context['top_entities'][:5]:
-            print(f"      • {entity['entity']:20} (mentioned {entity['frequency']}x)")
+        lines.append("\n🔍 Top Entities:")
+        lines.extend(
+            f"      • {entity['entity']:20} (mentioned {entity['frequency']}x)"
+            for entity in context['top_entities'][:5]
+        )
     
-    print("\n" + "=" * 70)
-    print("✅ Context Manager reduces token usage by 70-90% for long conversations!")
-    print("=" * 70)
+    lines.extend([
+        "\n" + "=" * 70,
+        "✅ Context Manager reduces token usage by 70-90% for long conversations!",
+        "=" * 70,
+    ])
+    emit(*lines)
     
-    input("\n\nPress Enter to continue to RTD Manager demo...")
+    _pause("\n\nPress Enter to continue to RTD Manager demo...")
 
 
 def demo_rtd_manager():
@@ -119,13 +169,13 @@ def demo_rtd_manager():
     clear_screen()
     print_header("⚡ REAL-TIME DATA MANAGER DEMO")
     
-    print("This demo shows how RTD Manager handles data freshness\n")
-    time.sleep(1)
+    emit("This demo shows how RTD Manager handles data freshness\n")
+    _pace(1)
     
     rtd = RealTimeDataManager()
     
     # Demo 1: Time-sensitive detection
-    print("🔍 TIME-SENSITIVE QUERY DETECTION\n")
+    emit("🔍 TIME-SENSITIVE QUERY DETECTION\n")
     
     queries = [
         ("What is the current Bitcoin price?", "finance"),
@@ -139,12 +189,19 @@ def demo_rtd_manager():
         is_ts = rtd.is_time_sensitive(query, category)
         interval = rtd.get_refresh_interval(query, category)
         emoji = "⚡" if is_ts else "📚"
-        print(f"{emoji} '{query}'")
-        print(f"   Time-Sensitive: {'YES' if is_ts else 'NO':3}  |  Refresh Every: {rtd._format_seconds(interval)}")
-        time.sleep(0.5)
+        emit(
+            f"{emoji} '{query}'",
+            f"   Time-Sensitive: {'YES' if is_ts else 'NO':3}  |  Refresh Every: {rtd._format_seconds(interval)}",
+        )
+        _pace(0.5)
+    
+    cache = rtd.cache_stats()
+    emit(
+        f"\n🗂️  Classification cache: {cache['hits']} hits / {cache['misses']} misses",
+        "\n\n📊 FRESHNESS CALCULATION\n",
+    )
     
     # Demo 2: Freshness calculation
-    print("\n\n📊 FRESHNESS CALCULATION\n")
     
     test_data = [
         ("Breaking: AI breakthrough announced", timedelta(seconds=45)),
@@ -155,26 +212,24 @@ def demo_rtd_manager():
         ("Monthly industry report", timedelta(days=30)),
     ]
     
-    for title, age in test_data:
-        result = {
-            'title': title,
-            'publishedDate': (datetime.utcnow() - age).isoformat()
-        }
-        freshness = rtd.calculate_freshness(result)
-        
+    now = datetime.utcnow()
+    test_results = [
+        {'title': title, 'publishedDate': (now - age).isoformat()}
+        for title, age in test_data
+    ]
+    
+    for (title, _), freshness in zip(test_data, rtd.calculate_freshness_batch(test_results, now)):
         # Color code based on status
         badge = freshness['badge']
         score = freshness['score']
         age_display = freshness['age_display']
         
-        print(f"{badge:12} | Score: {score:3}% | {age_display:12} | {title}")
-        time.sleep(0.5)
+        emit(f"{badge:12} | Score: {score:3}% | {age_display:12} | {title}")
+        _pace(0.5)
     
     # Demo 3: Live query analysis
-    print("\n\n🎯 LIVE QUERY ANALYSIS\n")
-    
     query = "What are the latest developments in AI?"
-    print(f"Query: '{query}'\n")
+    emit("\n\n🎯 LIVE QUERY ANALYSIS\n", f"Query: '{query}'\n")
     
     # Simulate results
     results = [
@@ -197,28 +252,76 @@ def demo_rtd_manager():
     
     status = rtd.get_rtd_status(query, results, "news")
     
-    print(f"Time-Sensitive:     {'✅ YES' if status['is_time_sensitive'] else '❌ NO'}")
-    print(f"Average Freshness:  {status['average_freshness']:.1f}%")
-    print(f"Overall Status:     {status['overall_status'].upper()}")
-    print(f"Refresh Interval:   {status['refresh_interval_display']}")
-    print(f"Auto-Refresh:       {'✅ ENABLED' if status['auto_refresh_enabled'] else '❌ DISABLED'}")
+    emit(
+        f"Time-Sensitive:     {'✅ YES' if status['is_time_sensitive'] else '❌ NO'}",
+        f"Average Freshness:  {status['average_freshness']:.1f}%",
+        f"Overall Status:     {status['overall_status'].upper()}",
+        f"Refresh Interval:   {status['refresh_interval_display']}",
+        f"Auto-Refresh:       {'✅ ENABLED' if status['auto_refresh_enabled'] else '❌ DISABLED'}",
+    )
     
     if status['auto_refresh_enabled']:
-        print(f"\n⏱️  Auto-refresh countdown:")
-        for i in range(5, 0, -1):
-            print(f"   Next refresh in: {i} seconds...", end='\r')
-            time.sleep(1)
-        print(f"   🔄 Refreshing now!          ")
+        emit("\n🔄 Stale-while-revalidate:")
+        asyncio.run(demo_swr(rtd, query, results))
     
-    print("\n" + "=" * 70)
-    print("✅ RTD Manager provides always-fresh data with smart refresh!")
-    print("=" * 70)
+    emit(
+        "\n" + "=" * 70,
+        "✅ RTD Manager provides always-fresh data with smart refresh!",
+        "=" * 70,
+    )
     
-    input("\n\nPress Enter to finish...")
+    _pause("\n\nPress Enter to finish...")
+
+
+async def demo_swr(rtd, query, results):
+    """Show cache hits being served while refreshes run in the background."""
+    async def fetch():
+        await asyncio.sleep(0.5 * PACE)
+        return results
+
+    labels = {
+        'miss': "MISS",
+        'fresh': "CACHED(fresh)",
+        'stale': "CACHED(stale, revalidating…)",
+    }
+
+    async def lookup(step):
+        start = time.perf_counter()
+        _, state = await rtd.get_with_swr(query, "news", fetch)
+        elapsed = (time.perf_counter() - start) * 1000
+        emit(f"   {step:28} -> {labels[state]:30} ({elapsed:.1f}ms)")
+
+    await lookup("First search")
+    await lookup("Repeat search")
+
+    # Age the cached entry past its refresh interval
+    key = rtd._cache_key(query, "news")
+    rtd.refresh_timers[key] -= timedelta(seconds=rtd.get_refresh_interval(query, "news"))
+    await lookup("After refresh interval")
+
+    await asyncio.gather(*rtd._revalidating.values())
+    await lookup("After background refresh")
 
 
 def main():
     """Run the demo."""
+    global PACE
+
+    parser = argparse.ArgumentParser(description="Advanced features demo")
+    parser.add_argument(
+        "--pace",
+        type=float,
+        default=None,
+        help="Pacing multiplier (default: $DEMO_PACE or 1.0; 0 disables pauses)",
+    )
+    args = parser.parse_args()
+    if args.pace is not None:
+        PACE = args.pace
+
+    if os.name == 'nt':
+        # Enables ANSI escape processing in the Windows console
+        os.system("")
+
     try:
         clear_screen()
         print_header("🚀 ADVANCED FEATURES DEMO")
@@ -240,7 +343,7 @@ This demo showcases two powerful systems:
 Let's see them in action!
         """)
         
-        input("\nPress Enter to start the demo...")
+        _pause("\nPress Enter to start the demo...")
         
         # Run demos
         demo_context_manager()
@@ -271,6 +374,9 @@ Both systems are now integrated into the SearXNG MCP Chat Interface!
 
    3. Start chatting and watch the magic happen!
 
+⏱️  Benchmarking:
+   DEMO_PACE=0 python demo_advanced_features.py
+
 📚 Documentation:
    See ADVANCED_FEATURES.md for detailed API documentation
 
@@ -14,6 +14,59 @@ import httpx
 BASE_URL = "http://localhost:8765"
 
 
+async def post_chat(client: httpx.AsyncClient, message: str, language: str, category: str) -> dict:
+    """Send one message to the chat API and return the JSON response."""
+    response = await client.post(
+        f"{BASE_URL}/api/chat",
+        json={
+            "message": message,
+            "language": language,
+            "category": category
+        }
+    )
+    return response.json()
+
+
+async def test_simple(client: httpx.AsyncClient) -> tuple[str, dict]:
+    """Test 1: Simple query."""
+    result = await post_chat(client, "What is Python programming language?", "en", "general")
+    return "Test 1: Simple search query", result
+
+
+async def test_it(client: httpx.AsyncClient) -> tuple[str, dict]:
+    """Test 2: Technical query."""
+    result = await post_chat(client, "Latest features in FastAPI framework", "en", "it")
+    return "Test 2: Technical/IT query", result
+
+
+async def test_zh(client: httpx.AsyncClient) -> tuple[str, dict]:
+    """Test 3: Multi-language query."""
+    result = await post_chat(client, "人工智能", "zh", "science")
+    return "Test 3: Multi-language query (Chinese)", result
+
+
+async def test_health(client: httpx.AsyncClient) -> tuple[str, dict]:
+    """Test 4: Health check."""
+    response = await client.get(f"{BASE_URL}/api/health")
+    return "Test 4: System health check", response.json()
+
+
+def print_chat_result(result: dict, show_goals: bool = False):
+    """Print a chat API result."""
+    print(f"Response received: {result.get('response', 'No response')[:200]}...")
+    print(f"Search results: {len(result.get('search_results', []))} sources found")
+    if show_goals:
+        print(f"Goals tracked: {len(result.get('goals', []))}")
+
+
+def print_health_result(health: dict):
+    """Print a health API result."""
+    print(f"Status: {health.get('status')}")
+    print(f"Instances checked: {len(health.get('instances', []))}")
+    healthy = sum(1 for i in health.get('instances', []) if i.get('status') == 'healthy')
+    print(f"Healthy instances: {healthy}/{len(health.get('instances', []))}")
+
+
 async def test_chat_api():
     """Test the chat API endpoint."""
     print("=" * 60)
@@ -21,73 +74,36 @@ async def test_chat_api():
     print("=" * 60)
     print()
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # Test 1: Simple query
-        print("Test 1: Simple search query")
-        print("-" * 60)
-        
-        response = await client.post(
-            f"{BASE_URL}/api/chat",
-            json={
-                "message": "What is Python programming language?",
-                "language": "en",
-                "category": "general"
-            }
-        )
-        
-        result = response.json()
-        print(f"Response received: {result.get('response', 'No response')[:200]}...")
-        print(f"Search results: {len(result.get('search_results', []))} sources found")
-        print(f"Goals tracked: {len(result.get('goals', []))}")
-        print()
-
-        # Test 2: Technical query
-        print("Test 2: Technical/IT query")
-        print("-" * 60)
-        
-        response = await client.post(
-            f"{BASE_URL}/api/chat",
-            json={
-                "message": "Latest features in FastAPI framework",
-                "language": "en",
-                "category": "it"
-            }
+    limits = httpx.Limits(max_keepalive_connections=8)
+    async with httpx.AsyncClient(timeout=30.0, limits=limits) as client:
+        # The requests are independent, so run them concurrently
+        results = await asyncio.gather(
+            test_simple(client),
+            test_it(client),
+            test_zh(client),
+            test_health(client),
+            return_exceptions=True,
         )
-        
-        result = response.json()
-        print(f"Response received: {result.get('response', 'No response')[:200]}...")
-        print(f"Search results: {len(result.get('search_results', []))} sources found")
-        print()
 
-        # Test 3: Multi-language
-        print("Test 3: Multi-language query (Chinese)")
-        print("-" * 60)
-        
-        response = await client.post(
-            f"{BASE_URL}/api/chat",
-            json={
-                "message": "人工智能",
-                "language": "zh",
-                "category": "science"
-            }
-        )
-        
-        result = response.json()
-        print(f"Response received: {result.get('response', 'No response')[:200]}...")
-        print(f"Search results: {len(result.get('search_results', []))} sources found")
-        print()
+    # Print in a deterministic order
+    printers = [
+        lambda r: print_chat_result(r, show_goals=True),
+        print_chat_result,
+        print_chat_result,
+        print_health_result,
+    ]
+    for outcome, printer in zip(results, printers):
+        if isinstance(outcome, httpx.ConnectError):
+            raise outcome
+        if isinstance(outcome, Exception):
+            print(f"❌ Request failed: {outcome}")
+            print()
+            continue
 
-        # Test 4: Health check
-        print("Test 4: System health check")
+        label, result = outcome
+        print(label)
         print("-" * 60)
-        
-        response = await client.get(f"{BASE_URL}/api/health")
-        health = response.json()
-        
-        print(f"Status: {health.get('status')}")
-        print(f"Instances checked: {len(health.get('instances', []))}")
-        healthy = sum(1 for i in health.get('instances', []) if i.get('status') == 'healthy')
-        print(f"Healthy instances: {healthy}/{len(health.get('instances', []))}")
+        printer(result)
         print()
 
     print("=" * 60)
@@ -0,0 +1,17 @@
+"""
+Helpers shared by the example scripts.
+"""
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+
+def parse_results(results):
+    """Parse search results, accepting raw JSON text or bytes."""
+    if isinstance(results, str):
+        results = results.encode()
+    if isinstance(results, (bytes, bytearray)):
+        return _json.loads(results)
+    return results
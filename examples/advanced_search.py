@@ -5,7 +5,8 @@ Demonstrates advanced features including bang syntax and multi-category searches
 """
 
 import asyncio
-import json
+
+from _common import parse_results
 
 from searxng_mcp.server import get_instance_manager
 
@@ -22,7 +23,7 @@ async def main():
     print("\n1. Bang syntax - GitHub search:")
     print("-" * 80)
     results = await manager.search(query="pytorch !gh")
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: pytorch !gh")
     print(f"Results: {len(data.get('results', []))} found")
 
@@ -30,7 +31,7 @@ async def main():
     print("\n2. Language modifier - German search:")
     print("-" * 80)
     results = await manager.search(query="künstliche intelligenz :de")
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: künstliche intelligenz :de")
     print(f"Results: {len(data.get('results', []))} found")
 
@@ -38,7 +39,7 @@ async def main():
     print("\n3. Multiple categories - IT & Science:")
     print("-" * 80)
     results = await manager.search(query="machine learning frameworks", categories="it,science")
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: machine learning frameworks")
     print("Categories: it,science")
     print(f"Results: {len(data.get('results', []))} found")
@@ -49,7 +50,7 @@ async def main():
     results = await manager.search(
         query="async python best practices", engines="github,stackoverflow"
     )
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: async python best practices")
     print("Engines: github,stackoverflow")
     print(f"Results: {len(data.get('results', []))} found")
@@ -60,7 +61,7 @@ async def main():
     results = await manager.search(
         query="transformer architecture", categories="science", engines="arxiv", time_range="month"
     )
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: transformer architecture")
     print("Category: science")
     print("Engine: arxiv")
@@ -73,7 +74,7 @@ async def main():
     results = await manager.search(
         query="educational videos", categories="videos", safesearch=2  # Strict
     )
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: educational videos")
     print("Category: videos")
     print("Safe search: 2 (strict)")
@@ -83,7 +84,7 @@ async def main():
     print("\n7. Pagination - Page 2 results:")
     print("-" * 80)
     results = await manager.search(query="python tutorials", page=2)
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: python tutorials")
     print("Page: 2")
     print(f"Results: {len(data.get('results', []))} found")
@@ -92,7 +93,7 @@ async def main():
     print("\n8. Regional engine - Baidu:")
     print("-" * 80)
     results = await manager.search(query="百度搜索", engines="baidu", language="zh")
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: 百度搜索 (Baidu Search)")
     print("Engine: baidu")
     print("Language: zh")
@@ -5,7 +5,8 @@ Demonstrates basic usage of the SearXNG MCP server.
 """
 
 import asyncio
-import json
+
+from _common import parse_results
 
 from searxng_mcp.server import get_instance_manager
 
@@ -22,7 +23,7 @@ async def main():
     print("\n1. Basic web search:")
     print("-" * 80)
     results = await manager.search(query="python asyncio")
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: python asyncio")
     print(f"Results: {len(data.get('results', []))} found")
     print(f"Instance: {data.get('_instance', 'N/A')}")
@@ -35,7 +36,7 @@ async def main():
     print("\n2. Image search:")
     print("-" * 80)
     results = await manager.search(query="sunset landscape", categories="images")
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: sunset landscape")
     print("Category: images")
     print(f"Results: {len(data.get('results', []))} found")
@@ -44,7 +45,7 @@ async def main():
     print("\n3. GitHub search:")
     print("-" * 80)
     results = await manager.search(query="fastmcp", engines="github")
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: fastmcp")
     print("Engine: github")
     print(f"Results: {len(data.get('results', []))} found")
@@ -53,7 +54,7 @@ async def main():
     print("\n4. Chinese language search:")
     print("-" * 80)
     results = await manager.search(query="人工智能", language="zh")
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: 人工智能 (Artificial Intelligence)")
     print("Language: zh (Chinese)")
     print(f"Results: {len(data.get('results', []))} found")
@@ -62,7 +63,7 @@ async def main():
     print("\n5. Recent news search:")
     print("-" * 80)
     results = await manager.search(query="AI breakthroughs", categories="news", time_range="week")
-    data = json.loads(results) if isinstance(results, str) else results
+    data = parse_results(results)
     print("Query: AI breakthroughs")
     print("Category: news")
     print("Time range: week")
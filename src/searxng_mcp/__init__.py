@@ -15,7 +15,9 @@ def __getattr__(name):
     if name in ("main", "mcp", "search", "list_categories", "get_instances"):
         from searxng_mcp import server
 
-        return getattr(server, name)
+        # Cache on the package so later lookups skip __getattr__
+        value = globals()[name] = getattr(server, name)
+        return value
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
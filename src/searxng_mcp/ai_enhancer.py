@@ -8,9 +8,21 @@ using Gemini Flash models via multiple providers:
 - Google Gemini (auto-detected latest Flash model)
 """
 
-import json
+import asyncio
+import gzip
+import hashlib
 import logging
 import os
+import re
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from json import JSONDecoder
+from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 try:
@@ -18,10 +30,496 @@ try:
 except ImportError:
     httpx = None
 
+try:
+    import aiohttp  # type: ignore[import-not-found]
+except ImportError:
+    aiohttp = None
+
+# All JSON encoding/decoding goes through _loads/_dumps; orjson when installed
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes, matching orjson.dumps."""
+        return json.dumps(obj).encode()
+
+
 from searxng_mcp.rate_limiter import RateLimiter
+from searxng_mcp.token_counter import truncate_tokens
 
 logger = logging.getLogger(__name__)
 
+# System prompts, built once at import rather than per request
+ENHANCEMENT_SYSTEM_PROMPT = """You are an expert research analyst with access to current web search results.
+
+CRITICAL INSTRUCTIONS:
+1. The search results provided are CURRENT and from TODAY. Use the provided current date/time, NOT your training cutoff date.
+2. Provide COMPREHENSIVE, DETAILED summaries - do not abbreviate or "whittle down" information.
+3. Extract facts and truths from ALL provided sources - be thorough and inclusive.
+4. Your summary should be 3-5 paragraphs of substantive analysis, not brief snippets.
+5. Include specific details, statistics, quotes, and findings from the sources.
+6. When referencing time-sensitive information, use the current date provided in the context.
+
+Your task:
+1. Provide a COMPREHENSIVE summary (3-5 substantial paragraphs) synthesizing ALL search results
+2. Extract 5-7 key insights or important findings (be specific and detailed)
+3. Recommend the top 3-5 most valuable sources with detailed explanations of why they're important
+
+Format your response as JSON with these keys:
+- summary: A comprehensive 3-5 paragraph analysis covering all major findings
+- insights: Array of 5-7 detailed key insights with specifics
+- sources: Array of top 3-5 source recommendations, each with:
+  - title: Source title
+  - url: Source URL
+  - reason: Detailed explanation (2-3 sentences) of why this source is valuable
+
+Be thorough, accurate, and comprehensive. Quality over brevity."""
+
+QUICK_SUMMARY_SYSTEM_PROMPT = (
+    "You are a concise research assistant. Summarize search results in exactly one paragraph."
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back on bad values."""
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment, falling back on bad values."""
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+# Per-result content budget in the prompt context (characters), optionally
+# tightened to a token budget (0 = characters only)
+MAX_CONTENT_CHARS = _env_int("SEARXNG_AI_SNIPPET_CHARS", 500)
+MAX_CONTENT_TOKENS = _env_int("SEARXNG_AI_SNIPPET_TOKENS", 0)
+
+# Snippets whose word 5-gram overlap with an earlier snippet reaches this
+# Jaccard similarity are sent as a reference to that result instead
+DUPLICATE_SNIPPET_THRESHOLD = 0.8
+
+# Connection pool limits for the shared provider client
+MAX_CONNECTIONS = _env_int("SEARXNG_AI_MAX_CONN", 256)
+MAX_KEEPALIVE_CONNECTIONS = _env_int("SEARXNG_AI_MAX_KEEPALIVE", 64)
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Gemini model used until background detection finds the latest Flash model
+DEFAULT_GEMINI_MODEL = "gemini-2.0-flash-exp"  # Fallback model (Jan 2026)
+
+# Detected Gemini models by API key, shared across AIEnhancer instances
+_detected_gemini_models: dict[str, str] = {}
+
+# Detected Gemini models keyed by a hash of the API key, persisted so restarts
+# skip detection for a day; different keys can see different model lists
+GEMINI_MODEL_CACHE_FILE = Path.home() / ".searxng_mcp" / "gemini_model.json"
+GEMINI_MODEL_CACHE_TTL = 86400  # seconds
+
+# Rate limiter and pooled HTTP clients shared by every AIEnhancer instance, so
+# all enhancers draw from one token bucket and one connection pool. A client is
+# bound to the event loop that created it, so there is one per running loop
+_rate_limiter = RateLimiter()
+_http_clients: dict[asyncio.AbstractEventLoop, Any] = {}
+
+# In-memory cache of successful enhancements and summaries, keyed by query
+# terms + result URLs
+ENHANCEMENT_CACHE_SIZE = 1024
+ENHANCEMENT_CACHE_TTL = _env_int("SEARXNG_AI_CACHE_TTL", 3600)  # seconds
+
+# Minimum query-term overlap (Jaccard) for reusing a cached response when the
+# result URLs are identical but the query is worded differently
+SIMILAR_QUERY_THRESHOLD = _env_float("SEARXNG_AI_CACHE_THRESHOLD", 0.8)
+
+QUERY_TERM_PATTERN = re.compile(r"\w+")
+
+# Concurrent enhancements arriving within this window share one provider
+# request, up to BATCH_MAX_SIZE result sets per request. Opt-in (default 0,
+# disabled) since every enhancement then waits out the window, and unrelated
+# queries end up in one prompt
+BATCH_WINDOW = _env_int("SEARXNG_AI_BATCH_WINDOW_MS", 0) / 1000
+BATCH_MAX_SIZE = _env_int("SEARXNG_AI_BATCH_MAX_SIZE", 8)
+
+BATCH_SYSTEM_PROMPT = ENHANCEMENT_SYSTEM_PROMPT + """
+
+You will receive several independent, numbered sets of search results. Analyze
+each set on its own and respond with a JSON object {"items": [...]} holding one
+object per set, in the same order, each with the keys described above."""
+
+# Request bodies at least this large are gzip-compressed for providers marked
+# gzip_requests. Opt-in (default 0, disabled) since request compression is not
+# a documented feature of those endpoints
+GZIP_MIN_BYTES = _env_int("SEARXNG_AI_GZIP_MIN_BYTES", 0)
+
+# How long Ollama keeps the model (and its prompt cache) loaded between requests
+OLLAMA_KEEP_ALIVE = os.environ.get("SEARXNG_AI_OLLAMA_KEEP_ALIVE", "10m")
+
+# Per-result block of the prompt context built by _prepare_context
+RESULT_TEMPLATE = "\n{0}. {1}\n   Source: {2}\n   URL: {3}\n   Content: {4}\n"
+
+
+# Response cache key: (namespace, model + result URL fingerprint, query terms)
+CacheKey = tuple[str, bytes, frozenset[str]]
+
+
+@dataclass(frozen=True, slots=True)
+class ProviderSpec:
+    """Request and response shape of one AI provider's generation endpoint."""
+
+    # Path under the provider base URL; may reference {model} and {api_key}
+    endpoint: str
+    # Builds the request body from (model, system_prompt, user_prompt)
+    build_payload: Callable[[str, str, str], dict[str, Any]]
+    # Pulls the generated JSON text out of the response body
+    extract: Callable[[dict[str, Any]], str]
+    # Streaming variants: endpoint, extra payload keys, and per-event text delta
+    stream_endpoint: str
+    stream_options: dict[str, Any]
+    extract_delta: Callable[[dict[str, Any]], str]
+    # Whether gzip request bodies may be sent when SEARXNG_AI_GZIP_MIN_BYTES is set
+    gzip_requests: bool = False
+
+
+def _chat_messages(system_prompt: str, user_prompt: str) -> list[dict[str, str]]:
+    """Build a system + user chat message list."""
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def _openrouter_payload(model: str, system_prompt: str, user_prompt: str) -> dict[str, Any]:
+    """OpenRouter chat completion request body."""
+    # Mark the static system prompt as a cacheable prefix for upstream
+    # providers that support prompt caching; others ignore cache_control
+    system_content = [
+        {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+    ]
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": user_prompt},
+        ],
+        "response_format": {"type": "json_object"},
+    }
+
+
+def _ollama_payload(model: str, system_prompt: str, user_prompt: str) -> dict[str, Any]:
+    """Ollama chat request body."""
+    return {
+        "model": model,
+        "messages": _chat_messages(system_prompt, user_prompt),
+        "stream": False,
+        "format": "json",
+        # Keep the model loaded so the system prompt prefix stays in its KV cache
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+    }
+
+
+def _gemini_payload(model: str, system_prompt: str, user_prompt: str) -> dict[str, Any]:
+    """Gemini generateContent request body."""
+    # A separate system instruction keeps the static prefix identical across
+    # requests, so Gemini's implicit context caching can reuse it
+    return {
+        "systemInstruction": {"parts": [{"text": system_prompt}]},
+        "contents": [{"role": "user", "parts": [{"text": user_prompt}]}],
+        "generationConfig": {
+            "response_mime_type": "application/json",
+        },
+    }
+
+
+def _openrouter_delta(data: dict[str, Any]) -> str:
+    """Get the text delta from an OpenRouter stream event."""
+    choices = data.get("choices")
+    return (choices[0].get("delta", {}).get("content") or "") if choices else ""
+
+
+def _ollama_delta(data: dict[str, Any]) -> str:
+    """Get the text delta from an Ollama stream line."""
+    return data.get("message", {}).get("content", "")
+
+
+def _gemini_delta(data: dict[str, Any]) -> str:
+    """Get the text delta from a Gemini stream event."""
+    candidates = data.get("candidates")
+    if not candidates:
+        return ""
+    parts = candidates[0].get("content", {}).get("parts", [])
+    return "".join(part.get("text", "") for part in parts)
+
+
+PROVIDER_SPECS: dict[str, ProviderSpec] = {
+    "openrouter": ProviderSpec(
+        endpoint="/chat/completions",
+        build_payload=_openrouter_payload,
+        extract=lambda data: data["choices"][0]["message"]["content"],
+        stream_endpoint="/chat/completions",
+        stream_options={"stream": True},
+        extract_delta=_openrouter_delta,
+        gzip_requests=True,
+    ),
+    "ollama": ProviderSpec(
+        endpoint="/chat",
+        build_payload=_ollama_payload,
+        extract=lambda data: data["message"]["content"],
+        stream_endpoint="/chat",
+        stream_options={"stream": True},
+        extract_delta=_ollama_delta,
+    ),
+    "gemini": ProviderSpec(
+        endpoint="/models/{model}:generateContent?key={api_key}",
+        build_payload=_gemini_payload,
+        extract=lambda data: data["candidates"][0]["content"]["parts"][0]["text"],
+        stream_endpoint="/models/{model}:streamGenerateContent?alt=sse&key={api_key}",
+        stream_options={},
+        extract_delta=_gemini_delta,
+        gzip_requests=True,
+    ),
+}
+
+
+_FIELD_DECODER = JSONDecoder()
+_JSON_SPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _closed_fields(buffer: str, pos: int) -> tuple[list[tuple[str, Any]], int]:
+    """
+    Parse the top-level object fields that are complete in a partial JSON reply.
+
+    Args:
+        buffer: JSON text received so far
+        pos: Offset returned by the previous call (0 for a new buffer)
+
+    Returns:
+        (key, value) pairs completed since pos, and the offset to resume from
+    """
+    skip = _JSON_SPACE.match
+    decode = _FIELD_DECODER.raw_decode
+    fields = []
+
+    if pos == 0:
+        start = skip(buffer).end()
+        if start >= len(buffer) or buffer[start] != "{":
+            return fields, 0
+        pos = start + 1
+
+    while True:
+        p = skip(buffer, pos).end()
+        if p < len(buffer) and buffer[p] == ",":
+            p = skip(buffer, p + 1).end()
+        try:
+            key, p = decode(buffer, p)
+            p = skip(buffer, p).end()
+            if not isinstance(key, str) or buffer[p : p + 1] != ":":
+                break
+            value, p = decode(buffer, skip(buffer, p + 1).end())
+        except ValueError:
+            break
+        # A value is only complete once the next separator has arrived
+        end = skip(buffer, p).end()
+        if buffer[end : end + 1] not in (",", "}"):
+            break
+        fields.append((key, value))
+        pos = end
+
+    return fields, pos
+
+
+@lru_cache(maxsize=8)
+def _provider_config(provider: str, api_key: str) -> Mapping[str, Any]:
+    """
+    Build the read-only configuration for one provider.
+
+    Request bodies are pre-serialized, so every provider's headers carry the
+    JSON content type.
+    """
+    match provider:
+        case "openrouter":
+            base_url = "https://openrouter.ai/api/v1"
+            headers = {
+                "Authorization": f"Bearer {api_key}",
+                "HTTP-Referer": "https://github.com/Grumpified-OGGVCT/SearXng_MCP",
+                "X-Title": "SearXNG MCP Server",
+            }
+        case "ollama":
+            base_url = "https://ollama.com/api"
+            headers = {"Authorization": f"Bearer {api_key}"}
+        case "gemini":
+            base_url = "https://generativelanguage.googleapis.com/v1beta"
+            headers = {}
+        case _:
+            return MappingProxyType({})
+
+    headers["Content-Type"] = "application/json"
+    return MappingProxyType({"base_url": base_url, "headers": MappingProxyType(headers)})
+
+
+def _gemini_key_hash(api_key: str) -> str:
+    """Identify an API key in the model cache file without storing the key."""
+    return hashlib.blake2b(api_key.encode(), digest_size=16).hexdigest()
+
+
+def _read_gemini_model_cache() -> dict[str, Any]:
+    """Read the saved {key hash: {"model", "saved_at"}} mapping, or {}."""
+    try:
+        entries = _loads(GEMINI_MODEL_CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def _load_cached_gemini_model(api_key: str) -> str | None:
+    """Get the Gemini model a recent process detected for this API key, or None."""
+    entry = _read_gemini_model_cache().get(_gemini_key_hash(api_key))
+    if not isinstance(entry, dict):
+        return None
+    saved_at = entry.get("saved_at")
+    if not isinstance(saved_at, (int, float)) or time.time() - saved_at > GEMINI_MODEL_CACHE_TTL:
+        return None
+    model = entry.get("model")
+    return model if isinstance(model, str) else None
+
+
+def _save_cached_gemini_model(api_key: str, model: str) -> None:
+    """Persist the model detected for this API key, replacing the file atomically."""
+    now = time.time()
+    entries = {
+        key_hash: entry
+        for key_hash, entry in _read_gemini_model_cache().items()
+        if isinstance(entry, dict)
+        and isinstance(entry.get("saved_at"), (int, float))
+        and now - entry["saved_at"] <= GEMINI_MODEL_CACHE_TTL
+    }
+    entries[_gemini_key_hash(api_key)] = {"model": model, "saved_at": now}
+    try:
+        GEMINI_MODEL_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = GEMINI_MODEL_CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_bytes(_dumps(entries))
+        os.replace(tmp_file, GEMINI_MODEL_CACHE_FILE)
+    except OSError as e:
+        logger.debug("Could not save detected Gemini model: %s", e)
+
+
+@lru_cache(maxsize=128)
+def _format_results(rows: tuple[tuple[str, str, str, str], ...]) -> str:
+    """Format (title, engine, url, content) rows into the prompt's result blocks."""
+    collapse = WHITESPACE_PATTERN.sub
+    snippets = [collapse(" ", row[3][:MAX_CONTENT_CHARS]).strip() for row in rows]
+    if MAX_CONTENT_TOKENS > 0:
+        snippets = [truncate_tokens(snippet, MAX_CONTENT_TOKENS) for snippet in snippets]
+    template = RESULT_TEMPLATE.format
+
+    return "".join(
+        template(i, title, engine, url, snippet)
+        for i, ((title, engine, url, _), snippet) in enumerate(
+            zip(rows, _dedupe_snippets(snippets)), 1
+        )
+    )
+
+
+def _dedupe_snippets(snippets: list[str]) -> list[str]:
+    """Replace snippets that repeat an earlier one with a reference to it."""
+    kept: list[tuple[int, set[tuple[str, ...]]]] = []
+    deduped = []
+    for i, snippet in enumerate(snippets, 1):
+        words = QUERY_TERM_PATTERN.findall(snippet.lower())
+        shingles = {tuple(words[j : j + 5]) for j in range(max(len(words) - 4, 1))}
+        duplicate_of = None
+        if words:
+            for j, other in kept:
+                if len(shingles & other) >= DUPLICATE_SNIPPET_THRESHOLD * len(shingles | other):
+                    duplicate_of = j
+                    break
+        if duplicate_of is None:
+            kept.append((i, shingles))
+            deduped.append(snippet)
+        else:
+            deduped.append(f"(same as result {duplicate_of})")
+    return deduped
+
+
+def _latest_flash_model(data: dict[str, Any]) -> str | None:
+    """
+    Pick the latest Gemini Flash model from a models.list response.
+
+    Returns:
+        Model ID, or None if the list has no Flash models
+    """
+    # Find all flash models and sort by version
+    flash_models = []
+    for model in data.get("models", []):
+        name = model.get("name", "")
+        # Extract model name from "models/gemini-x.x-flash-xxx" format
+        if "flash" in name.lower():
+            model_id = name.split("/")[-1] if "/" in name else name
+            # Prefer experimental versions as they're the latest
+            if "exp" in model_id or "latest" in model_id:
+                flash_models.insert(0, model_id)
+            else:
+                flash_models.append(model_id)
+
+    # Return the first (most recent) flash model found
+    return flash_models[0] if flash_models else None
+
+
+async def _get_http_client() -> Any:
+    """
+    Get the pooled HTTP client for the running event loop, creating it on first use.
+
+    Uses an aiohttp session when aiohttp is installed (lower tail latency
+    under concurrent enhancements), otherwise an httpx AsyncClient.
+    """
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is not None:
+        return client
+
+    # Clients of loops that have since closed can no longer be used or closed
+    for stale_loop in [stale for stale in _http_clients if stale.is_closed()]:
+        del _http_clients[stale_loop]
+
+    # No await between the lookup and the store, so no lock is needed
+    if aiohttp is not None:
+        client = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=60),
+            connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS, ttl_dns_cache=300),
+        )
+    else:
+        client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    _http_clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the running event loop's shared HTTP client, if one was created."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        if aiohttp is not None:
+            await client.close()
+        else:
+            await client.aclose()
+
 
 class AIEnhancer:
     """
@@ -31,118 +529,195 @@ class AIEnhancer:
     - OpenRouter: google/gemini-2.0-flash-exp
     - Ollama Cloud: gemini-3-flash-preview:cloud
     - Google Gemini: Auto-detected latest Flash model
+
+    The shared connection pool is sized by SEARXNG_AI_MAX_CONN (default 256)
+    and SEARXNG_AI_MAX_KEEPALIVE (default 64).
     """
 
+    __slots__ = (
+        "provider",
+        "api_key",
+        "model",
+        "enabled",
+        "_detect_model",
+        "_model_task",
+        "_available",
+        "config",
+        "_base_url",
+        "_headers",
+        "_url",
+        "_stream_url",
+        "_enhancement_cache",
+        "_cached_terms",
+        "_pending",
+        "_batch_timer",
+        "_batch_tasks",
+        "rate_limiter",
+    )
+
     def __init__(self) -> None:
         """Initialize AI enhancer with configuration."""
         self.provider = os.environ.get("SEARXNG_AI_PROVIDER", "").lower()
         self.api_key = os.environ.get("SEARXNG_AI_API_KEY", "")
         self.model = os.environ.get("SEARXNG_AI_MODEL", "")
         self.enabled = self.provider and self.api_key
+        # Configured and an HTTP transport is installed; checked on every call
+        self._available = bool(self.enabled) and (aiohttp is not None or httpx is not None)
 
         # Set default models based on provider
         # All providers use Gemini Flash for optimal speed/cost/quality balance
+        self._detect_model = False
         if self.provider == "openrouter" and not self.model:
             self.model = "google/gemini-2.0-flash-exp"
         elif self.provider == "ollama" and not self.model:
             self.model = "gemini-3-flash-preview:cloud"
         elif self.provider == "gemini" and not self.model:
-            # Auto-detect latest Flash model or use current default
-            self.model = self._get_latest_gemini_flash_model()
+            # Start on the recently detected or known default model; the latest
+            # Flash model is detected in the background on first use
+            detected = _detected_gemini_models.get(self.api_key) or _load_cached_gemini_model(
+                self.api_key
+            )
+            self.model = detected or DEFAULT_GEMINI_MODEL
+            self._detect_model = detected is None
+        self._model_task: asyncio.Task | None = None
 
-        # Provider configurations
+        # Provider configuration, shared read-only by enhancers with the same key
         self.config = self._get_provider_config()
+        self._base_url: str = self.config.get("base_url", "")
+        self._headers: Mapping[str, str] = self.config.get("headers", {})
+        # Resolved on first request, and again if the model changes
+        self._url = ""
+        self._stream_url = ""
+
+        # (namespace, model + URL fingerprint, query terms) -> (expires_at, response),
+        # least recently used first
+        self._enhancement_cache: OrderedDict[CacheKey, tuple[float, dict[str, Any]]] = OrderedDict()
+        # (namespace, fingerprint) -> cached query term sets, so the similar-query
+        # scan only visits entries for the same result URLs
+        self._cached_terms: dict[tuple[str, bytes], set[frozenset[str]]] = {}
+
+        # Enhancement contexts waiting for the current batch window to close
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._batch_timer: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task] = set()
+
+        # Rate limit state is shared by every enhancer in the process
+        self.rate_limiter = _rate_limiter
+        logger.info(
+            "AI enhancer initialized with provider: %s, model: %s", self.provider, self.model
+        )
+
+    def _get_provider_config(self) -> Mapping[str, Any]:
+        """Get provider-specific configuration."""
+        return _provider_config(self.provider, self.api_key)
 
-        # Initialize rate limiter
-        self.rate_limiter = RateLimiter()
-        logger.info(f"AI enhancer initialized with provider: {self.provider}, model: {self.model}")
+    def _get_endpoint_url(self, stream: bool = False) -> str:
+        """Get the provider's generation endpoint URL."""
+        spec = PROVIDER_SPECS.get(self.provider)
+        if spec is None:
+            return ""
 
-    def _get_provider_config(self) -> dict[str, Any]:
-        """Get provider-specific configuration."""
-        configs = {
-            "openrouter": {
-                "base_url": "https://openrouter.ai/api/v1",
-                "headers": {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "HTTP-Referer": "https://github.com/Grumpified-OGGVCT/SearXng_MCP",
-                    "X-Title": "SearXNG MCP Server",
-                },
-            },
-            "ollama": {
-                "base_url": "https://ollama.com/api",
-                "headers": {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-            },
-            "gemini": {
-                "base_url": "https://generativelanguage.googleapis.com/v1beta",
-                "headers": {
-                    "Content-Type": "application/json",
-                },
-                "api_key_param": True,  # Gemini uses ?key= parameter
-                "api_key": self.api_key,  # Store API key for Gemini
-            },
-        }
+        template = spec.stream_endpoint if stream else spec.endpoint
+        endpoint = template.format(model=self.model, api_key=self.api_key)
+        return f"{self._base_url}{endpoint}"
 
-        return configs.get(self.provider, {})
+    def is_enabled(self) -> bool:
+        """Check if AI enhancement is enabled."""
+        return self._available
 
-    def _get_latest_gemini_flash_model(self) -> str:
-        """
-        Auto-detect the latest Gemini Flash model.
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        await close_http_client()
 
-        Returns the latest available Flash model or falls back to known default.
-        Checks Google's model list API for the newest gemini-*-flash model.
-        """
-        default_model = "gemini-2.0-flash-exp"  # Fallback model (Jan 2026)
+    async def warmup(self) -> None:
+        """Open a connection to the provider ahead of the first request."""
+        if not self.is_enabled() or not self.config:
+            return
 
-        if not self.api_key or httpx is None:
-            return default_model
+        # Gemini model detection connects to the same host as a side effect
+        if self._detect_model and self._model_task is None:
+            self._model_task = asyncio.create_task(self._refresh_model())
+            await self._model_task
+            return
 
         try:
-            # Try to fetch available models from Google API
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(
-                    f"https://generativelanguage.googleapis.com/v1beta/models?key={self.api_key}"
-                )
+            client = await _get_http_client()
+            url = f"{self._base_url}/"
+            if aiohttp is not None:
+                async with client.head(url):
+                    pass
+            else:
+                await client.head(url)
+        except Exception:
+            logger.debug("Connection warmup for %s failed", self.provider)
 
-                if response.status_code == 200:
-                    data = response.json()
-                    models = data.get("models", [])
-
-                    # Find all flash models and sort by version
-                    flash_models = []
-                    for model in models:
-                        name = model.get("name", "")
-                        # Extract model name from "models/gemini-x.x-flash-xxx" format
-                        if "flash" in name.lower():
-                            model_id = name.split("/")[-1] if "/" in name else name
-                            # Prefer experimental versions as they're the latest
-                            if "exp" in model_id or "latest" in model_id:
-                                flash_models.insert(0, model_id)
-                            else:
-                                flash_models.append(model_id)
-
-                    # Return the first (most recent) flash model found
-                    if flash_models:
-                        return flash_models[0]
-                else:
-                    # Log non-200 responses for debugging
-                    logger.warning(
-                        f"Gemini model detection failed with status {response.status_code}, "
-                        f"using fallback model {default_model}"
-                    )
+    async def _post_json(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        POST a JSON payload to the provider endpoint and parse the response.
 
-        except Exception:
-            # Log but don't fail - just use default
-            # Don't log exception details to avoid exposing API key
-            logger.debug(f"Could not auto-detect Gemini model, using fallback: {default_model}")
+        Args:
+            payload: Request body
 
-        return default_model
+        Returns:
+            Parsed JSON response
+        """
+        client = await _get_http_client()
+        if not self._url:
+            self._url = self._get_endpoint_url()
 
-    def is_enabled(self) -> bool:
-        """Check if AI enhancement is enabled."""
-        return self.enabled and httpx is not None
+        body, headers = self._encode_body(_dumps(payload))
+
+        if aiohttp is not None:
+            async with client.post(self._url, headers=headers, data=body) as response:
+                if response.status == 429:
+                    self._raise_rate_limited(response.status)
+                response.raise_for_status()
+                return _loads(await response.read())
+
+        response = await client.post(self._url, headers=headers, content=body)
+        if response.status_code == 429:
+            self._raise_rate_limited(response.status_code)
+        response.raise_for_status()
+        return _loads(response.content)
+
+    async def _stream_lines(self, body: bytes) -> AsyncIterator[str]:
+        """POST a request body to the streaming endpoint and yield response lines."""
+        client = await _get_http_client()
+        if not self._stream_url:
+            self._stream_url = self._get_endpoint_url(stream=True)
+
+        body, headers = self._encode_body(body)
+
+        if aiohttp is not None:
+            async with client.post(self._stream_url, headers=headers, data=body) as response:
+                if response.status == 429:
+                    self._raise_rate_limited(response.status)
+                response.raise_for_status()
+                async for line in response.content:
+                    yield line.decode()
+            return
+
+        async with client.stream(
+            "POST", self._stream_url, headers=headers, content=body
+        ) as response:
+            if response.status_code == 429:
+                self._raise_rate_limited(response.status_code)
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                yield line
+
+    def _encode_body(self, body: bytes) -> tuple[bytes, Mapping[str, str]]:
+        """Gzip a large request body when the provider accepts it."""
+        spec = PROVIDER_SPECS.get(self.provider)
+        if spec is None or not spec.gzip_requests or not 0 < GZIP_MIN_BYTES <= len(body):
+            return body, self._headers
+        # Level 1 gets most of the size reduction at a fraction of the CPU cost
+        return gzip.compress(body, compresslevel=1), {**self._headers, "Content-Encoding": "gzip"}
+
+    def _raise_rate_limited(self, status: int) -> None:
+        """Raise for a provider-side rate limit response."""
+        logger.error("Rate limit error from %s: HTTP %s", self.provider, status)
+        raise Exception(f"Rate limit exceeded by provider: {self.provider}")
 
     async def enhance_results(
         self, query: str, results: list[dict], max_results: int = 10
@@ -158,205 +733,416 @@ class AIEnhancer:
         Returns:
             Enhanced results with AI summary, key insights, and organized data
         """
-        if not self.is_enabled():
-            return {
-                "enhanced": False,
-                "reason": "AI enhancement not configured",
-                "original_results": results,
-            }
+        skipped = self._check_enhanceable(results, max_results)
+        if skipped:
+            return skipped
+
+        cache_key = self._cache_key("enhance", query, results[:max_results])
+        cached = self._get_cached(cache_key)
+        if cached:
+            match, response = cached
+            return {**response, "query": query, "original_results": results, "cached": match}
 
         try:
             # Prepare context from search results
-            context = self._prepare_context(query, results[:max_results])
+            context = await self._build_context(query, results[:max_results])
 
             # Generate AI enhancement
             enhancement = await self._generate_enhancement(query, context)
 
+            enhanced = self._build_enhanced(query, results, enhancement)
+            self._store_cached(cache_key, enhanced)
+            return enhanced
+
+        except Exception as e:
             return {
-                "enhanced": True,
-                "query": query,
-                "ai_summary": enhancement.get("summary", ""),
-                "key_insights": enhancement.get("insights", []),
-                "recommended_sources": enhancement.get("sources", []),
+                "enhanced": False,
+                "reason": f"AI enhancement failed: {str(e)}",
                 "original_results": results,
-                "model": self.model,
-                "provider": self.provider,
             }
 
+    async def enhance_and_summarize(
+        self, query: str, results: list[dict], max_results: int = 10
+    ) -> dict[str, Any]:
+        """
+        Enhance search results and generate a quick summary concurrently.
+
+        Args:
+            query: Original search query
+            results: Raw search results from SearXNG
+            max_results: Maximum number of results to process
+
+        Returns:
+            enhance_results() output with an added "quick_summary" key
+        """
+        enhanced, summary = await asyncio.gather(
+            self.enhance_results(query, results, max_results),
+            self.quick_summary(query, results),
+        )
+        return {**enhanced, "quick_summary": summary}
+
+    async def enhance_results_stream(
+        self, query: str, results: list[dict], max_results: int = 10
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Enhance search results, streaming the generated text as it arrives.
+
+        Args:
+            query: Original search query
+            results: Raw search results from SearXNG
+            max_results: Maximum number of results to process
+
+        Yields:
+            {"type": "delta", "content": str} events while the provider generates,
+            a {"type": "field", "key": str, "value": Any} event as each top-level
+            reply field (summary, insights, sources) completes, then one
+            {"type": "result", "result": dict} event shaped like enhance_results()
+        """
+        skipped = self._check_enhanceable(results, max_results)
+        if skipped:
+            yield {"type": "result", "result": skipped}
+            return
+
+        cache_key = self._cache_key("enhance", query, results[:max_results])
+        cached = self._get_cached(cache_key)
+        if cached:
+            match, response = cached
+            yield {
+                "type": "result",
+                "result": {
+                    **response,
+                    "query": query,
+                    "original_results": results,
+                    "cached": match,
+                },
+            }
+            return
+
+        try:
+            context = await self._build_context(query, results[:max_results])
+
+            text = ""
+            parsed_to = 0
+            async for delta in self._stream_provider(
+                ENHANCEMENT_SYSTEM_PROMPT, self._enhancement_prompt(context)
+            ):
+                text += delta
+                yield {"type": "delta", "content": delta}
+
+                fields, parsed_to = _closed_fields(text, parsed_to)
+                for key, value in fields:
+                    yield {"type": "field", "key": key, "value": value}
+
+            enhancement = _loads(text)
+            enhanced = self._build_enhanced(query, results, enhancement)
+            self._store_cached(cache_key, enhanced)
+            yield {"type": "result", "result": enhanced}
+
         except Exception as e:
+            yield {
+                "type": "result",
+                "result": {
+                    "enhanced": False,
+                    "reason": f"AI enhancement failed: {str(e)}",
+                    "original_results": results,
+                },
+            }
+
+    def _check_enhanceable(self, results: list[dict], max_results: int) -> dict[str, Any] | None:
+        """Get the not-enhanced response when enhancement should be skipped, else None."""
+        if not self.is_enabled():
             return {
                 "enhanced": False,
-                "reason": f"AI enhancement failed: {str(e)}",
+                "reason": "AI enhancement not configured",
+                "original_results": results,
+            }
+
+        # Nothing to summarize - skip the provider round-trip
+        if not results or max_results <= 0:
+            return {
+                "enhanced": False,
+                "reason": "No results to enhance",
                 "original_results": results,
             }
 
+        return None
+
+    def _cache_key(self, namespace: str, query: str, results: list[dict]) -> CacheKey:
+        """Build a response cache key from the query terms, model, and result URLs."""
+        urls = "\x00".join([self.model, *(r.get("url", "") for r in results)])
+        fingerprint = hashlib.blake2b(urls.encode(), digest_size=16).digest()
+        return namespace, fingerprint, frozenset(QUERY_TERM_PATTERN.findall(query.lower()))
+
+    def _get_cached(self, key: CacheKey) -> tuple[str, dict[str, Any]] | None:
+        """
+        Get a cached response as ("exact" | "similar", response), or None.
+
+        Exact key matches are a single dict lookup. On a miss, falls back to
+        the closest cached query for the same namespace and result URLs whose
+        terms overlap by at least SIMILAR_QUERY_THRESHOLD.
+        """
+        cache = self._enhancement_cache
+        now = time.monotonic()
+
+        match = "exact"
+        if key not in cache:
+            namespace, fingerprint, terms = key
+            best_similarity = SIMILAR_QUERY_THRESHOLD
+            best_terms = None
+            for other_terms in self._cached_terms.get((namespace, fingerprint), ()):
+                union = len(terms | other_terms)
+                similarity = len(terms & other_terms) / union if union else 1.0
+                if similarity >= best_similarity:
+                    best_similarity, best_terms = similarity, other_terms
+            if best_terms is None:
+                return None
+            key = (namespace, fingerprint, best_terms)
+            match = "similar"
+
+        expires_at, response = cache[key]
+        if now >= expires_at:
+            self._drop_cached(key)
+            return None
+
+        cache.move_to_end(key)
+        return match, response
+
+    def _store_cached(self, key: CacheKey, response: dict[str, Any]) -> None:
+        """Store a response, evicting the least recently used entry when full."""
+        self._enhancement_cache[key] = (time.monotonic() + ENHANCEMENT_CACHE_TTL, response)
+        self._enhancement_cache.move_to_end(key)
+        namespace, fingerprint, terms = key
+        self._cached_terms.setdefault((namespace, fingerprint), set()).add(terms)
+        if len(self._enhancement_cache) > ENHANCEMENT_CACHE_SIZE:
+            self._drop_cached(next(iter(self._enhancement_cache)))
+
+    def _drop_cached(self, key: CacheKey) -> None:
+        """Remove a response and its similar-query index entry."""
+        del self._enhancement_cache[key]
+        namespace, fingerprint, terms = key
+        group = self._cached_terms[(namespace, fingerprint)]
+        group.discard(terms)
+        if not group:
+            del self._cached_terms[(namespace, fingerprint)]
+
+    def _build_enhanced(
+        self, query: str, results: list[dict], enhancement: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Build the enhanced response from a parsed provider reply."""
+        return {
+            "enhanced": True,
+            "query": query,
+            "ai_summary": enhancement.get("summary", ""),
+            "key_insights": enhancement.get("insights", []),
+            "recommended_sources": enhancement.get("sources", []),
+            "original_results": results,
+            "model": self.model,
+            "provider": self.provider,
+        }
+
+    async def _build_context(self, query: str, results: list[dict]) -> str:
+        """
+        Prepare the prompt context, off the event loop when it tokenizes.
+
+        Tokenizer truncation is CPU-bound, so it runs on the loop's default
+        executor (shut down with the loop) instead of stalling other requests.
+        """
+        if MAX_CONTENT_TOKENS <= 0:
+            return self._prepare_context(query, results)
+        return await asyncio.to_thread(self._prepare_context, query, results)
+
     def _prepare_context(self, query: str, results: list[dict]) -> str:
         """Prepare context from search results for AI processing."""
-        from datetime import datetime
-
         # Get current date and time for context
         current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
 
-        context_parts = [
-            f"Current Date and Time: {current_datetime}\n",
-            "Note: Use this current date for any time-sensitive analysis, not your training cutoff date.\n\n",
-            f"Search Query: {query}\n\n",
-            f"Search Results ({len(results)} sources):\n",
-        ]
-
-        for i, result in enumerate(results, 1):
-            title = result.get("title", "No title")
-            url = result.get("url", "")
-            content = result.get("content", "")
-            engine = result.get("engine", "unknown")
-
-            context_parts.append(
-                f"\n{i}. {title}\n"
-                f"   Source: {engine}\n"
-                f"   URL: {url}\n"
-                f"   Content: {content}\n"
+        header = (
+            f"Current Date and Time: {current_datetime}\n"
+            "Note: Use this current date for any time-sensitive analysis, not your training cutoff date.\n\n"
+            f"Search Query: {query}\n\n"
+            f"Search Results ({len(results)} sources):\n"
+        )
+
+        # Pull each result's fields once; retries with the same results reuse
+        # the formatted block
+        rows = tuple(
+            (
+                result.get("title", "No title"),
+                result.get("engine", "unknown"),
+                result.get("url", ""),
+                result.get("content") or "",
             )
-
-        return "".join(context_parts)
+            for result in results
+        )
+        return header + _format_results(rows)
 
     async def _generate_enhancement(self, query: str, context: str) -> dict[str, Any]:
-        """Generate AI enhancement using configured provider."""
-        system_prompt = """You are an expert research analyst with access to current web search results.
+        """
+        Generate AI enhancement using configured provider.
 
-CRITICAL INSTRUCTIONS:
-1. The search results provided are CURRENT and from TODAY. Use the provided current date/time, NOT your training cutoff date.
-2. Provide COMPREHENSIVE, DETAILED summaries - do not abbreviate or "whittle down" information.
-3. Extract facts and truths from ALL provided sources - be thorough and inclusive.
-4. Your summary should be 3-5 paragraphs of substantive analysis, not brief snippets.
-5. Include specific details, statistics, quotes, and findings from the sources.
-6. When referencing time-sensitive information, use the current date provided in the context.
+        Enhancements requested within BATCH_WINDOW of each other are sent to
+        the provider as one batched request.
+        """
+        if BATCH_WINDOW <= 0 or BATCH_MAX_SIZE <= 1:
+            return await self._call_provider(
+                ENHANCEMENT_SYSTEM_PROMPT, self._enhancement_prompt(context)
+            )
 
-Your task:
-1. Provide a COMPREHENSIVE summary (3-5 substantial paragraphs) synthesizing ALL search results
-2. Extract 5-7 key insights or important findings (be specific and detailed)
-3. Recommend the top 3-5 most valuable sources with detailed explanations of why they're important
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((context, future))
+        if len(self._pending) >= BATCH_MAX_SIZE:
+            self._flush_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = loop.call_later(BATCH_WINDOW, self._flush_batch)
+        return await future
+
+    def _flush_batch(self) -> None:
+        """Send the pending enhancement contexts as one batch."""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        """Generate enhancements for a batch and resolve each waiting future."""
+        contexts = [context for context, _ in batch]
+        try:
+            outcomes = await self._generate_batch(contexts)
+        except Exception as e:
+            outcomes = [e] * len(batch)
 
-Format your response as JSON with these keys:
-- summary: A comprehensive 3-5 paragraph analysis covering all major findings
-- insights: Array of 5-7 detailed key insights with specifics
-- sources: Array of top 3-5 source recommendations, each with:
-  - title: Source title
-  - url: Source URL
-  - reason: Detailed explanation (2-3 sentences) of why this source is valuable
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
 
-Be thorough, accurate, and comprehensive. Quality over brevity."""
+    async def _generate_batch(self, contexts: list[str]) -> list[dict[str, Any] | BaseException]:
+        """
+        Generate one enhancement per context, sharing a request when possible.
 
-        user_prompt = f"{context}\n\nProvide a comprehensive enhancement of these search results."
+        Returns:
+            One enhancement, or the exception its own call raised, per context
+        """
+        if len(contexts) > 1:
+            user_prompt = "\n\n".join(
+                f"=== Result set {i} ===\n{self._enhancement_prompt(context)}"
+                for i, context in enumerate(contexts, 1)
+            )
+            try:
+                response = await self._call_provider(BATCH_SYSTEM_PROMPT, user_prompt)
+            except Exception as e:
+                # One bad combined reply must not fail every caller in the batch
+                logger.debug("Batched call failed (%s), retrying individually", e)
+            else:
+                items = response.get("items")
+                if isinstance(items, list) and len(items) == len(contexts):
+                    return items
+                logger.debug("Batched reply had no usable items, retrying individually")
+
+        return list(
+            await asyncio.gather(
+                *(
+                    self._call_provider(
+                        ENHANCEMENT_SYSTEM_PROMPT, self._enhancement_prompt(context)
+                    )
+                    for context in contexts
+                ),
+                return_exceptions=True,
+            )
+        )
+
+    def _enhancement_prompt(self, context: str) -> str:
+        """Build the user prompt for a full enhancement."""
+        return f"{context}\n\nProvide a comprehensive enhancement of these search results."
+
+    async def _call_provider(self, system_prompt: str, user_prompt: str) -> dict[str, Any]:
+        """Call the configured provider's API with rate limiting."""
+        spec = await self._prepare_call()
+        data = await self._post_json(spec.build_payload(self.model, system_prompt, user_prompt))
+        return _loads(spec.extract(data))
+
+    async def _stream_provider(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        """Stream generated text deltas from the configured provider."""
+        spec = await self._prepare_call()
+        payload = {
+            **spec.build_payload(self.model, system_prompt, user_prompt),
+            **spec.stream_options,
+        }
 
-        if self.provider == "openrouter":
-            return await self._call_openrouter(system_prompt, user_prompt)
-        elif self.provider == "ollama":
-            return await self._call_ollama(system_prompt, user_prompt)
-        elif self.provider == "gemini":
-            return await self._call_gemini(system_prompt, user_prompt)
-        else:
+        async for line in self._stream_lines(_dumps(payload)):
+            # SSE events arrive as "data: {...}"; Ollama sends bare JSON lines
+            line = line.strip()
+            if line.startswith("data:"):
+                line = line[5:].strip()
+            if not line or line.startswith(":") or line == "[DONE]":
+                continue
+
+            delta = spec.extract_delta(_loads(line))
+            if delta:
+                yield delta
+
+    async def _prepare_call(self) -> ProviderSpec:
+        """Check the provider and rate limit before a call."""
+        spec = PROVIDER_SPECS.get(self.provider)
+        if spec is None:
             raise ValueError(f"Unsupported provider: {self.provider}")
 
-    async def _call_openrouter(self, system_prompt: str, user_prompt: str) -> dict[str, Any]:
-        """Call OpenRouter API with rate limiting."""
         # Check rate limit
         allowed = await self.rate_limiter.wait_if_needed(self.provider)
         if not allowed:
             raise Exception(f"Rate limit exceeded for {self.provider}")
 
-        try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.config['base_url']}/chat/completions",
-                    headers=self.config["headers"],
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_prompt},
-                        ],
-                        "response_format": {"type": "json_object"},
-                    },
-                )
+        # Detect the latest model in the background; this call uses the current one
+        if self._detect_model and self._model_task is None:
+            self._model_task = asyncio.create_task(self._refresh_model())
 
-                response.raise_for_status()
-                data = response.json()
-
-                content = data["choices"][0]["message"]["content"]
-                return json.loads(content)
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                logger.error(f"Rate limit error from {self.provider}: {e}")
-                raise Exception(f"Rate limit exceeded by provider: {self.provider}")
-            raise
-
-    async def _call_ollama(self, system_prompt: str, user_prompt: str) -> dict[str, Any]:
-        """Call Ollama Cloud API with rate limiting."""
-        # Check rate limit
-        allowed = await self.rate_limiter.wait_if_needed(self.provider)
-        if not allowed:
-            raise Exception(f"Rate limit exceeded for {self.provider}")
+        return spec
 
+    async def _refresh_model(self) -> None:
+        """Auto-detect the latest Gemini Flash model from Google's model list API."""
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.config['base_url']}/chat",
-                    headers=self.config["headers"],
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_prompt},
-                        ],
-                        "stream": False,
-                        "format": "json",
-                    },
-                )
-
-                response.raise_for_status()
-                data = response.json()
-
-                content = data["message"]["content"]
-                return json.loads(content)
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                logger.error(f"Rate limit error from {self.provider}: {e}")
-                raise Exception(f"Rate limit exceeded by provider: {self.provider}")
-            raise
-
-    async def _call_gemini(self, system_prompt: str, user_prompt: str) -> dict[str, Any]:
-        """Call Google Gemini API with rate limiting."""
-        # Check rate limit
-        allowed = await self.rate_limiter.wait_if_needed(self.provider)
-        if not allowed:
-            raise Exception(f"Rate limit exceeded for {self.provider}")
-
-        # Combine system and user prompts for Gemini
-        combined_prompt = f"{system_prompt}\n\n{user_prompt}"
+            client = await _get_http_client()
+            url = f"{self._base_url}/models?key={self.api_key}"
 
-        try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.config['base_url']}/models/{self.model}:generateContent?key={self.api_key}",
-                    headers=self.config["headers"],
-                    json={
-                        "contents": [{"parts": [{"text": combined_prompt}]}],
-                        "generationConfig": {
-                            "response_mime_type": "application/json",
-                        },
-                    },
+            if aiohttp is not None:
+                async with client.get(url) as response:
+                    status = response.status
+                    body = await response.read()
+            else:
+                response = await client.get(url)
+                status, body = response.status_code, response.content
+
+            if status != 200:
+                # Log non-200 responses for debugging
+                logger.warning(
+                    "Gemini model detection failed with status %s, keeping model %s",
+                    status,
+                    self.model,
                 )
+                return
 
-                response.raise_for_status()
-                data = response.json()
+            model = _latest_flash_model(_loads(body))
+            if model:
+                _detected_gemini_models[self.api_key] = model
+                _save_cached_gemini_model(self.api_key, model)
+                self.model = model
+                self._url = ""
+                self._stream_url = ""
+                self._detect_model = False
 
-                content = data["candidates"][0]["content"]["parts"][0]["text"]
-                return json.loads(content)
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                logger.error(f"Rate limit error from {self.provider}: {e}")
-                raise Exception(f"Rate limit exceeded by provider: {self.provider}")
-            raise
+        except Exception:
+            # Log but don't fail - just keep the current model
+            # Don't log exception details to avoid exposing API key
+            logger.debug("Could not auto-detect Gemini model, keeping: %s", self.model)
 
     async def quick_summary(self, query: str, results: list[dict]) -> str:
         """
@@ -372,22 +1158,27 @@ Be thorough, accurate, and comprehensive. Quality over brevity."""
         if not self.is_enabled():
             return "AI enhancement not available."
 
+        if not results:
+            return "No results to summarize."
+
+        cache_key = self._cache_key("summary", query, results[:5])
+        cached = self._get_cached(cache_key)
+        if cached:
+            return cached[1]["summary"]
+
         try:
-            context = self._prepare_context(query, results[:5])
+            context = await self._build_context(query, results[:5])
 
-            system_prompt = "You are a concise research assistant. Summarize search results in exactly one paragraph."
             user_prompt = f"{context}\n\nProvide a one-paragraph summary."
 
-            if self.provider == "openrouter":
-                response = await self._call_openrouter(system_prompt, user_prompt)
-            elif self.provider == "ollama":
-                response = await self._call_ollama(system_prompt, user_prompt)
-            elif self.provider == "gemini":
-                response = await self._call_gemini(system_prompt, user_prompt)
-            else:
+            if self.provider not in PROVIDER_SPECS:
                 return "Unsupported AI provider."
 
-            return response.get("summary", "Summary generation failed.")
+            response = await self._call_provider(QUICK_SUMMARY_SYSTEM_PROMPT, user_prompt)
+            if "summary" not in response:
+                return "Summary generation failed."
+            self._store_cached(cache_key, {"summary": response["summary"]})
+            return response["summary"]
 
         except Exception as e:
             return f"Summary generation failed: {str(e)}"
@@ -395,11 +1186,23 @@ Be thorough, accurate, and comprehensive. Quality over brevity."""
 
 # Global enhancer instance
 _enhancer: AIEnhancer | None = None
+_warmup_task: asyncio.Task | None = None
 
 
 def get_ai_enhancer() -> AIEnhancer:
-    """Get or create global AI enhancer instance."""
-    global _enhancer
+    """
+    Get or create global AI enhancer instance.
+
+    When created inside a running event loop, the provider connection is
+    warmed up in the background.
+    """
+    global _enhancer, _warmup_task
     if _enhancer is None:
         _enhancer = AIEnhancer()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass  # No loop yet - the first request opens the connection
+        else:
+            _warmup_task = loop.create_task(_enhancer.warmup())
     return _enhancer
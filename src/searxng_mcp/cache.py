@@ -2,18 +2,95 @@
 Result Caching System for SearXNG MCP Server
 
 Provides TTL-based caching for search results to reduce API costs and improve response times.
-Implements file-based caching with automatic expiration and cleanup.
+Entries are appended to a single log file of length-prefixed frames, with an in-memory
+index of where each live entry sits, automatic expiration, and compaction. Processes
+sharing a cache directory coordinate through an flock()ed lock file.
 """
 
 import hashlib
-import json
 import logging
+import os
+import struct
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+# Cache entries are compact UTF-8 JSON bytes; orjson when installed
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes, matching orjson.dumps."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+# Cross-process locking; without fcntl (Windows) a cache directory must not be
+# shared by several processes
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# Name of the append-only entry log inside the cache directory
+LOG_FILENAME = "cache.log"
+
+# Lock file serializing log appends, compaction and truncation across processes;
+# unlike the log it is never replaced, so every process locks the same inode
+LOCK_FILENAME = "cache.lock"
+
+# Marks the log format; logs without it are discarded and started fresh
+LOG_MAGIC = b"SXC\x02"
+
+# Each frame header holds the payload length, expires_at, and the 16-byte cache
+# key digest, so expiry and indexing never need the payload decoded
+FRAME_HEADER = struct.Struct(">Id16s")
+
+# Logs smaller than this are never compacted
+COMPACT_MIN_BYTES = 1024 * 1024
+
+# Decoded entries kept in memory, least recently used evicted first
+MEMORY_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=1024)
+def _cache_key(
+    query: str,
+    categories: str,
+    engines: str,
+    language: str,
+    time_range: str,
+    safesearch: int,
+    ai_enhance: bool,
+) -> str:
+    """Hash normalized search parameters; memoized since get() and set() repeat them."""
+    # Create deterministic key from parameters
+    key_components = [
+        query.lower().strip(),
+        categories.lower().strip(),
+        engines.lower().strip(),
+        language.lower().strip(),
+        time_range.lower().strip(),
+        str(safesearch),
+        str(ai_enhance),
+    ]
+    key_string = "|".join(key_components)
+    # Non-cryptographic use; blake2b is faster than SHA-256 on short inputs
+    return hashlib.blake2b(key_string.encode(), digest_size=16).hexdigest()
+
 
 class ResultCache:
     """
@@ -25,6 +102,10 @@ class ResultCache:
     - Cache hit/miss statistics
     - Automatic cleanup of expired entries
     - Thread-safe file operations
+
+    Entries live in one append-only log file. A cache hit is an in-memory index
+    lookup plus a single read of the entry's bytes; the log is rewritten
+    without dead frames once they make up more than half of it.
     """
 
     def __init__(self, cache_dir: Path | None = None, default_ttl: int = 3600):
@@ -61,6 +142,151 @@ class ResultCache:
             "evictions": 0,
         }
 
+        # cache key -> (payload offset, payload length, expires_at)
+        self._index: dict[str, tuple[int, int, float]] = {}
+        self._live_bytes = 0
+        # Log file size, tracked on every write so stats never touch the disk
+        self._log_size = 0
+        # cache key -> decoded result data for recently used entries
+        self._memory: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._log_path = self.cache_dir / LOG_FILENAME
+        self._lock_file = open(self.cache_dir / LOCK_FILENAME, "a+b")  # noqa: SIM115
+        self._log = None
+
+        with self._lock, self._file_lock(exclusive=True):
+            self._open_log(exclusive=True)
+            removed = self._remove_legacy_entries()
+        if removed:
+            logger.info(f"Removed {removed} cache entries in the old one-file-per-key format")
+        self._prefetch_log()
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool) -> Iterator[None]:
+        """Hold the cross-process lock; callers must already hold self._lock."""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _open_log(self, exclusive: bool) -> None:
+        """(Re)open the log and rebuild the index from scratch."""
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self._log_path, "a+b")  # noqa: SIM115 - closed in close()
+        self._index.clear()
+        self._memory.clear()
+        self._live_bytes = 0
+        self._log_size = 0
+        self._load_index(exclusive)
+
+    def _sync(self, exclusive: bool) -> None:
+        """Pick up frames other processes appended, or their compacted or cleared log."""
+        try:
+            replaced = os.stat(self._log_path).st_ino != os.fstat(self._log.fileno()).st_ino
+        except FileNotFoundError:
+            replaced = True
+
+        if replaced or os.fstat(self._log.fileno()).st_size < self._log_size:
+            self._open_log(exclusive)
+        else:
+            self._load_index(exclusive)
+
+    def _load_index(self, exclusive: bool) -> None:
+        """
+        Index the frames after the last one seen, dropping a torn trailing frame.
+
+        Only a caller holding the exclusive lock may reset or truncate the log;
+        under the shared lock a torn tail is skipped and left for the next writer.
+        """
+        log = self._log
+        end = log.seek(0, os.SEEK_END)
+        pos = self._log_size
+        if pos == 0:
+            log.seek(0)
+            if log.read(len(LOG_MAGIC)) != LOG_MAGIC:
+                if not exclusive:
+                    return
+                if end:
+                    logger.warning("Discarding cache log in an unknown format")
+                self._reset_log()
+                return
+            pos = len(LOG_MAGIC)
+
+        now = time.time()
+        while pos + FRAME_HEADER.size <= end:
+            log.seek(pos)
+            length, expires_at, digest = FRAME_HEADER.unpack(log.read(FRAME_HEADER.size))
+            start = pos + FRAME_HEADER.size
+            if start + length > end:
+                break
+
+            # Later frames for a key replace earlier ones
+            key = digest.hex()
+            self._forget(key)
+            if expires_at > now:
+                self._index[key] = (start, length, expires_at)
+                self._live_bytes += FRAME_HEADER.size + length
+            pos = start + length
+
+        if pos < end and exclusive:
+            logger.warning(f"Truncating {end - pos} unreadable bytes from cache log")
+            log.truncate(pos)
+        self._log_size = pos
+
+    def _prefetch_log(self) -> None:
+        """Ask the kernel to read the log into the page cache in the background."""
+        if not self._index or not hasattr(os, "posix_fadvise"):
+            return
+        try:
+            os.posix_fadvise(self._log.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError as e:
+            logger.debug(f"Cache log prefetch unavailable: {e}")
+
+    def _reset_log(self) -> None:
+        """
+        Replace the log with one holding only the format marker.
+
+        The log is swapped for a new file rather than truncated in place, so other
+        processes see a different inode and rebuild instead of misreading offsets.
+        """
+        tmp_path = self._log_path.with_suffix(".tmp")
+        tmp_path.write_bytes(LOG_MAGIC)
+        self._log.close()
+        os.replace(tmp_path, self._log_path)
+        self._log = open(self._log_path, "a+b")  # noqa: SIM115 - closed in close()
+        self._log_size = len(LOG_MAGIC)
+
+    def _remove_legacy_entries(self) -> int:
+        """Delete entries left from the earlier one-file-per-key layout."""
+        count = 0
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    os.unlink(entry.path)
+                    count += 1
+        return count
+
+    def _remember(self, cache_key: str, data: dict[str, Any]) -> None:
+        """Keep decoded data in memory, evicting the least recently used entry."""
+        self._memory[cache_key] = data
+        self._memory.move_to_end(cache_key)
+        if len(self._memory) > MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+
+    def _forget(self, cache_key: str) -> bool:
+        """Drop a key from the index. Returns True if it was present."""
+        self._memory.pop(cache_key, None)
+        location = self._index.pop(cache_key, None)
+        if location is None:
+            return False
+        self._live_bytes -= FRAME_HEADER.size + location[1]
+        return True
+
     def _get_cache_key(
         self,
         query: str,
@@ -84,20 +310,9 @@ class ResultCache:
             ai_enhance: Whether AI enhancement is enabled
 
         Returns:
-            SHA256 hash as cache key
+            BLAKE2b (128-bit) hex digest as cache key
         """
-        # Create deterministic key from parameters
-        key_components = [
-            query.lower().strip(),
-            categories.lower().strip(),
-            engines.lower().strip(),
-            language.lower().strip(),
-            time_range.lower().strip(),
-            str(safesearch),
-            str(ai_enhance),
-        ]
-        key_string = "|".join(key_components)
-        return hashlib.sha256(key_string.encode()).hexdigest()
+        return _cache_key(query, categories, engines, language, time_range, safesearch, ai_enhance)
 
     def _get_ttl_for_query(self, categories: str = "") -> int:
         """
@@ -136,30 +351,47 @@ class ResultCache:
         cache_key = self._get_cache_key(
             query, categories, engines, language, time_range, safesearch, ai_enhance
         )
-        cache_file = self.cache_dir / f"{cache_key}.json"
 
         try:
-            if not cache_file.exists():
-                self.stats["misses"] += 1
-                return None
-
-            with open(cache_file, encoding="utf-8") as f:
-                cache_entry = json.load(f)
-
-            # Check expiration
-            if time.time() > cache_entry["expires_at"]:
-                logger.debug(f"Cache expired for key {cache_key[:8]}...")
-                cache_file.unlink(missing_ok=True)
-                self.stats["misses"] += 1
-                self.stats["evictions"] += 1
-                return None
+            with self._lock:
+                location = self._index.get(cache_key)
+                if location is None:
+                    # Another process may have written the entry since we last looked
+                    with self._file_lock(exclusive=False):
+                        self._sync(exclusive=False)
+                    location = self._index.get(cache_key)
+                if location is None:
+                    self.stats["misses"] += 1
+                    return None
+
+                # Check expiration without reading the entry
+                offset, length, expires_at = location
+                if time.time() > expires_at:
+                    logger.debug(f"Cache expired for key {cache_key[:8]}...")
+                    self._forget(cache_key)
+                    self.stats["misses"] += 1
+                    self.stats["evictions"] += 1
+                    return None
+
+                data = self._memory.get(cache_key)
+                if data is not None:
+                    self._memory.move_to_end(cache_key)
+                else:
+                    self._log.seek(offset - FRAME_HEADER.size)
+                    frame = self._log.read(FRAME_HEADER.size + length)
+                    if FRAME_HEADER.unpack_from(frame)[2].hex() != cache_key:
+                        raise ValueError("index points at another entry")
+                    data = _loads(frame[FRAME_HEADER.size :])["data"]
+                    self._remember(cache_key, data)
 
             logger.info(f"Cache hit for query: {query[:50]}...")
             self.stats["hits"] += 1
-            return cache_entry["data"]
+            return data
 
         except Exception as e:
             logger.warning(f"Cache read error for key {cache_key[:8]}...: {e}")
+            with self._lock:
+                self._forget(cache_key)
             self.stats["misses"] += 1
             return None
 
@@ -193,7 +425,6 @@ class ResultCache:
         cache_key = self._get_cache_key(
             query, categories, engines, language, time_range, safesearch, ai_enhance
         )
-        cache_file = self.cache_dir / f"{cache_key}.json"
 
         try:
             ttl = self._get_ttl_for_query(categories)
@@ -206,8 +437,21 @@ class ResultCache:
                 "data": data,
             }
 
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(cache_entry, f, ensure_ascii=False, indent=2)
+            payload = _dumps(cache_entry)
+
+            with self._lock, self._file_lock(exclusive=True):
+                self._sync(exclusive=True)
+                offset = self._log.seek(0, os.SEEK_END) + FRAME_HEADER.size
+                expires_at = cache_entry["expires_at"]
+                header = FRAME_HEADER.pack(len(payload), expires_at, bytes.fromhex(cache_key))
+                self._log.write(header + payload)
+                self._log.flush()
+                self._forget(cache_key)
+                self._index[cache_key] = (offset, len(payload), expires_at)
+                self._live_bytes += FRAME_HEADER.size + len(payload)
+                self._log_size = offset + len(payload)
+                self._remember(cache_key, data)
+                self._maybe_compact()
 
             logger.debug(f"Cached result for query: {query[:50]}... (TTL: {ttl}s)")
             self.stats["writes"] += 1
@@ -226,9 +470,15 @@ class ResultCache:
         """
         count = 0
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
-                cache_file.unlink()
-                count += 1
+            with self._lock, self._file_lock(exclusive=True):
+                self._sync(exclusive=True)
+                count = len(self._index)
+                self._index.clear()
+                self._memory.clear()
+                self._live_bytes = 0
+                self._reset_log()
+                count += self._remove_legacy_entries()
+
             logger.info(f"Cleared {count} cache entries")
             return count
         except Exception as e:
@@ -245,21 +495,19 @@ class ResultCache:
         count = 0
         try:
             current_time = time.time()
-            for cache_file in self.cache_dir.glob("*.json"):
-                try:
-                    with open(cache_file, encoding="utf-8") as f:
-                        cache_entry = json.load(f)
-
-                    if current_time > cache_entry["expires_at"]:
-                        cache_file.unlink()
-                        count += 1
-                        self.stats["evictions"] += 1
-
-                except Exception as e:
-                    logger.warning(f"Error checking cache file {cache_file.name}: {e}")
-                    # Delete corrupted cache files
-                    cache_file.unlink(missing_ok=True)
-                    count += 1
+            with self._lock, self._file_lock(exclusive=True):
+                # Index other processes' frames too, so compaction keeps them
+                self._sync(exclusive=True)
+                expired = [
+                    key
+                    for key, (_, _, expires_at) in self._index.items()
+                    if current_time > expires_at
+                ]
+                for key in expired:
+                    self._forget(key)
+                count = len(expired)
+                self.stats["evictions"] += count
+                self._maybe_compact()
 
             if count > 0:
                 logger.info(f"Cleaned up {count} expired cache entries")
@@ -269,6 +517,41 @@ class ResultCache:
             logger.error(f"Cache cleanup error: {e}")
             return count
 
+    def _maybe_compact(self) -> None:
+        """
+        Rewrite the log without dead frames once they are the majority.
+
+        Callers hold the exclusive lock and have synced the index, so no other
+        process appends to the old log while its live frames are copied.
+        """
+        size = self._log_size
+        if size < COMPACT_MIN_BYTES or self._live_bytes * 2 > size:
+            return
+
+        tmp_path = self._log_path.with_suffix(".tmp")
+        index: dict[str, tuple[int, int, float]] = {}
+        with open(tmp_path, "wb") as tmp:
+            tmp.write(LOG_MAGIC)
+            for key, (offset, length, expires_at) in sorted(
+                self._index.items(), key=lambda item: item[1][0]
+            ):
+                self._log.seek(offset - FRAME_HEADER.size)
+                tmp.write(self._log.read(FRAME_HEADER.size + length))
+                index[key] = (tmp.tell() - length, length, expires_at)
+
+        self._log.close()
+        os.replace(tmp_path, self._log_path)
+        self._log = open(self._log_path, "a+b")  # noqa: SIM115 - closed in close()
+        self._index = index
+        self._log_size = len(LOG_MAGIC) + self._live_bytes
+        logger.debug(f"Compacted cache log from {size} to {self._live_bytes} bytes")
+
+    def close(self) -> None:
+        """Close the cache log and lock files."""
+        with self._lock:
+            self._log.close()
+            self._lock_file.close()
+
     def get_stats(self) -> dict[str, Any]:
         """
         Get cache statistics.
@@ -283,7 +566,7 @@ class ResultCache:
             **self.stats,
             "total_requests": total_requests,
             "hit_rate_percent": round(hit_rate, 2),
-            "cache_size_files": len(list(self.cache_dir.glob("*.json"))),
+            "cache_size_files": len(self._index),
         }
 
     def get_cache_info(self) -> dict[str, Any]:
@@ -295,8 +578,8 @@ class ResultCache:
         """
         stats = self.get_stats()
 
-        # Calculate cache size
-        total_size = sum(f.stat().st_size for f in self.cache_dir.glob("*.json"))
+        # Size of the entry log, including not-yet-compacted frames
+        total_size = self._log_size
 
         return {
             **stats,
@@ -4,8 +4,12 @@ Configuration module for SearXNG MCP Server.
 Handles loading configuration from environment variables and config files.
 """
 
+import copy
 import os
+from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
 # Default configuration
 DEFAULT_CONFIG = {
@@ -22,10 +26,24 @@ DEFAULT_CONFIG = {
 }
 
 
+# Environment variable -> (config key, parser); values that fail to parse are ignored
+ENV_PARSERS: dict[str, tuple[str, Callable[[str], Any]]] = {
+    "SEARXNG_INSTANCES": ("instances", lambda v: [i.strip() for i in v.split(",")]),
+    "SEARXNG_LOCAL_INSTANCE": ("local_instance", str.strip),
+    "SEARXNG_TIMEOUT": ("timeout", float),
+    "SEARXNG_LOCAL_TIMEOUT": ("local_timeout", float),
+    "SEARXNG_COOKIE_DIR": ("cookie_dir", str),
+}
+
+
 def get_config() -> dict:
     """
     Load configuration from environment variables.
 
+    The environment is read once and cached; after changing it, call
+    _load_config.cache_clear() to pick up the new values. Each call returns
+    its own copy, so callers may modify it freely.
+
     Environment Variables:
         SEARXNG_INSTANCES: Comma-separated list of instance URLs
         SEARXNG_LOCAL_INSTANCE: Optional local instance URL
@@ -36,36 +54,20 @@ def get_config() -> dict:
     Returns:
         Configuration dictionary
     """
-    config = DEFAULT_CONFIG.copy()
-
-    # Load instances from environment
-    instances_env = os.environ.get("SEARXNG_INSTANCES")
-    if instances_env:
-        config["instances"] = [i.strip() for i in instances_env.split(",")]
-
-    # Load local instance
-    local_instance = os.environ.get("SEARXNG_LOCAL_INSTANCE")
-    if local_instance:
-        config["local_instance"] = local_instance.strip()
+    return copy.deepcopy(_load_config())
 
-    # Load timeouts
-    timeout = os.environ.get("SEARXNG_TIMEOUT")
-    if timeout:
-        try:
-            config["timeout"] = float(timeout)
-        except ValueError:
-            pass
 
-    local_timeout = os.environ.get("SEARXNG_LOCAL_TIMEOUT")
-    if local_timeout:
-        try:
-            config["local_timeout"] = float(local_timeout)
-        except ValueError:
-            pass
+@lru_cache(maxsize=1)
+def _load_config() -> dict:
+    """Parse the configuration from the environment, once per cache_clear()."""
+    config = copy.deepcopy(DEFAULT_CONFIG)
 
-    # Load cookie directory
-    cookie_dir = os.environ.get("SEARXNG_COOKIE_DIR")
-    if cookie_dir:
-        config["cookie_dir"] = cookie_dir
+    for env_var, (key, parse) in ENV_PARSERS.items():
+        value = os.environ.get(env_var)
+        if value:
+            try:
+                config[key] = parse(value)
+            except ValueError:
+                pass
 
     return config
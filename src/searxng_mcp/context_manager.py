@@ -7,11 +7,56 @@ reducing token usage by 70-90% while preserving key information.
 
 import logging
 import re
-from datetime import datetime
+import time
+from bisect import bisect_right
+from collections import Counter, deque
+from collections.abc import Iterator
+from itertools import islice
 from typing import Any
 
+from searxng_mcp.token_counter import exact_count, fast_estimate
+
 logger = logging.getLogger(__name__)
 
+# Fact indicators combined into one alternation so each sentence is scanned once
+FACT_INDICATOR_PATTERN = re.compile(
+    r"\b(?:is|are|was|were|has|have|shows|indicates|reveals|confirms|demonstrates)\b",
+    re.IGNORECASE,
+)
+
+# Oldest facts and compressed blocks are evicted past these sizes
+MAX_KEY_FACTS = 2000
+MAX_COMPRESSED_BLOCKS = 5000
+
+# Simple capitalized word extraction (can be enhanced with NER)
+ENTITY_PATTERN = re.compile(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b")
+
+SENTENCE_SPLIT_PATTERN = re.compile(r"[.!?]+")
+SENTENCE_PATTERN = re.compile(r"[^.!?]+")
+TOPIC_WORD_PATTERN = re.compile(r"\b\w{4,}\b")
+BULLET_PATTERN = re.compile(r"(?:^|\n)[\*\-\d+\.]\s*([^\n]{20,100})")
+
+# Question words to exclude from topics
+TOPIC_STOPWORDS = frozenset({"what", "when", "where", "which", "about", "this", "that", "with"})
+
+# Common words to exclude from entities
+COMMON_WORDS = frozenset(
+    {
+        "The",
+        "This",
+        "That",
+        "These",
+        "Those",
+        "When",
+        "Where",
+        "What",
+        "Why",
+        "How",
+        "Which",
+        "Who",
+    }
+)
+
 
 class InfiniteContextManager:
     """
@@ -30,6 +75,8 @@ class InfiniteContextManager:
         recent_messages_limit: int = 10,
         max_compressed_chars: int = 500,
         compression_threshold: int = 15,
+        trigger_tokens: int | None = None,
+        target_tokens: int | None = None,
     ):
         """
         Initialize the context manager.
@@ -38,15 +85,39 @@ class InfiniteContextManager:
             recent_messages_limit: Number of recent messages to keep in full
             max_compressed_chars: Max chars per compressed message block
             compression_threshold: Start compression after this many messages
+            trigger_tokens: Use a token-budget sliding window instead of the message
+                count threshold; slide once the window reaches this many tokens
+            target_tokens: Window size to slide down to (default: trigger_tokens // 2)
         """
         self.recent_messages_limit = recent_messages_limit
         self.max_compressed_chars = max_compressed_chars
         self.compression_threshold = compression_threshold
-
-        self.messages: list[dict[str, Any]] = []
-        self.compressed_blocks: list[dict[str, Any]] = []
-        self.key_facts: list[dict[str, Any]] = []
-        self.entities: dict[str, int] = {}  # entity -> frequency
+        self.trigger_tokens = trigger_tokens
+        self.target_tokens = target_tokens
+        if trigger_tokens and target_tokens is None:
+            self.target_tokens = trigger_tokens // 2
+
+        # Deque so evicting the oldest messages is O(1) per message
+        self.messages: deque[dict[str, Any]] = deque()
+        # Tokens currently held in self.messages: a running cheap estimate, and the
+        # best known count (exact once the window gets close to trigger_tokens)
+        self._fast_total = 0
+        self.token_count = 0
+        # System messages the sliding window never evicts
+        self._pinned: list[dict[str, Any]] = []
+        self.compressed_blocks: deque[dict[str, Any]] = deque(maxlen=MAX_COMPRESSED_BLOCKS)
+        self.key_facts: deque[dict[str, Any]] = deque(maxlen=MAX_KEY_FACTS)
+        self.entities: Counter[str] = Counter()  # entity -> frequency
+
+        # Structured anchor summary, merged incrementally with each compressed span
+        self._anchor: dict[str, Any] = {
+            "intent": "",
+            "facts": [],
+            "entities": Counter(),
+            "decisions": [],
+            "next_steps": [],
+        }
+        self._anchor_fact_hashes: set[int] = set()
 
         self.total_messages = 0
         self.original_tokens = 0
@@ -64,12 +135,12 @@ class InfiniteContextManager:
         message = {
             "role": role,
             "content": content,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": time.time(),
             "metadata": metadata or {},
             "tokens": self._estimate_tokens(content),
         }
 
-        self.messages.append(message)
+        self._append_message(message)
         self.total_messages += 1
         self.original_tokens += message["tokens"]
 
@@ -79,9 +150,89 @@ class InfiniteContextManager:
             self._extract_entities(content)
 
         # Trigger compression if needed
-        if len(self.messages) > self.compression_threshold:
+        self._maybe_compress()
+
+    def add_messages_bulk(self, messages: list[tuple[str, str]]) -> None:
+        """
+        Add several messages at once.
+
+        Fact/entity extraction runs in a single pass over the joined batch and the
+        compression threshold is evaluated once at the end instead of per message.
+
+        Args:
+            messages: List of (role, content) tuples in conversation order
+        """
+        if not messages:
+            return
+
+        timestamp = time.time()
+        new_messages = [
+            {
+                "role": role,
+                "content": content,
+                "timestamp": timestamp,
+                "metadata": {},
+                "tokens": self._estimate_tokens(content),
+            }
+            for role, content in messages
+        ]
+
+        for message in new_messages:
+            self._append_message(message)
+        self.total_messages += len(new_messages)
+        self.original_tokens += sum(m["tokens"] for m in new_messages)
+
+        extractable = [m for m in new_messages if m["role"] in ("user", "assistant")]
+        if extractable:
+            self._extract_bulk(extractable)
+
+        self._maybe_compress()
+
+    def _append_message(self, message: dict[str, Any]) -> None:
+        """Append a message to the window, pinning system messages in token mode."""
+        if self.trigger_tokens and message["role"] == "system":
+            self._pinned.append(message)
+            return
+
+        self.messages.append(message)
+        self._fast_total += message["tokens"]
+
+    def _maybe_compress(self) -> None:
+        """Compress older messages once the window passes its threshold."""
+        self._refresh_token_count()
+
+        if self.trigger_tokens:
+            if self.token_count >= self.trigger_tokens:
+                self._slide_window()
+        elif len(self.messages) > self.compression_threshold:
             self.compress_old_context()
 
+    def _refresh_token_count(self) -> None:
+        """Update token_count, running the exact tokenizer only near the trigger."""
+        if self.trigger_tokens and self._fast_total > 0.9 * self.trigger_tokens:
+            self.token_count = exact_count("\n".join(m["content"] for m in self.messages))
+        else:
+            self.token_count = self._fast_total
+
+    def _slide_window(self) -> None:
+        """Evict the oldest turns until the window fits within target_tokens."""
+        evicted = []
+
+        # Drop whole turns so the first retained message is a user message,
+        # but always keep the latest message
+        while len(self.messages) > 1 and (
+            self._fast_total > self.target_tokens or self.messages[0]["role"] != "user"
+        ):
+            message = self.messages.popleft()
+            self._fast_total -= message["tokens"]
+            evicted.append(message)
+
+        if not evicted:
+            return
+
+        self._refresh_token_count()
+        self._compress_messages(evicted)
+
     def get_context(self, max_tokens: int | None = None) -> dict[str, Any]:
         """
         Get optimized context for the model.
@@ -94,9 +245,9 @@ class InfiniteContextManager:
         """
         context = {
             "compressed_summary": self._build_compressed_summary(),
-            "key_facts": self.key_facts[-20:],  # Last 20 facts
+            "key_facts": self._last(self.key_facts, 20),  # Last 20 facts
             "top_entities": self._get_top_entities(10),
-            "recent_messages": self.messages[-self.recent_messages_limit :],
+            "recent_messages": self._pinned + self._recent_messages(),
             "metadata": {
                 "total_turns": self.total_messages // 2,  # Approximate conversation turns
                 "compressed_blocks": len(self.compressed_blocks),
@@ -111,34 +262,70 @@ class InfiniteContextManager:
 
         return context
 
+    @staticmethod
+    def _last(items: deque[dict[str, Any]], count: int) -> list[dict[str, Any]]:
+        """Get the newest count items of a deque, walking only those from the right."""
+        newest = list(islice(reversed(items), count))
+        newest.reverse()
+        return newest
+
+    def _recent_messages(self) -> list[dict[str, Any]]:
+        """Get the messages kept in full detail."""
+        # The token window is already bounded, so return all of it
+        start = 0 if self.trigger_tokens else len(self.messages) - self.recent_messages_limit
+        return list(islice(self.messages, max(start, 0), None))
+
     def compress_old_context(self) -> None:
         """Compress older messages into summarized blocks."""
         # Keep recent messages, compress the rest
         if len(self.messages) <= self.recent_messages_limit:
             return
 
-        messages_to_compress = self.messages[: -self.recent_messages_limit]
+        # Remove compressed messages from the front of the window
+        evict_count = len(self.messages) - self.recent_messages_limit
+        messages_to_compress = [self.messages.popleft() for _ in range(evict_count)]
+        self._fast_total -= sum(m["tokens"] for m in messages_to_compress)
+        self._refresh_token_count()
 
-        if not messages_to_compress:
-            return
+        self._compress_messages(messages_to_compress)
 
+    def _compress_messages(self, messages_to_compress: list[dict[str, Any]]) -> None:
+        """Compress evicted messages into summary blocks and the anchor summary."""
         # Group messages into conversation blocks (user-assistant pairs)
         blocks = self._group_into_blocks(messages_to_compress)
 
         for block in blocks:
             compressed = self._compress_block(block)
             if compressed:
+                if len(self.compressed_blocks) == self.compressed_blocks.maxlen:
+                    # The append below evicts the oldest block
+                    self.compressed_tokens -= self.compressed_blocks[0]["summary_tokens"]
                 self.compressed_blocks.append(compressed)
-                self.compressed_tokens += self._estimate_tokens(compressed["summary"])
+                self.compressed_tokens += compressed["summary_tokens"]
 
-        # Remove compressed messages
-        self.messages = self.messages[-self.recent_messages_limit :]
+        # Fold only the newly evicted span into the anchor summary
+        self._merge_anchor(self._summarize_span(messages_to_compress))
 
         logger.info(f"Compressed {len(messages_to_compress)} messages into {len(blocks)} blocks")
 
+    def get_anchor(self) -> dict[str, Any]:
+        """
+        Get the structured anchor summary of all compressed context.
+
+        Returns:
+            Dictionary with intent, facts, entities, decisions and next_steps
+        """
+        return {
+            "intent": self._anchor["intent"],
+            "facts": list(self._anchor["facts"]),
+            "entities": dict(self._anchor["entities"]),
+            "decisions": list(self._anchor["decisions"]),
+            "next_steps": list(self._anchor["next_steps"]),
+        }
+
     def extract_facts(self) -> list[dict[str, Any]]:
         """Extract key facts from all messages."""
-        return self.key_facts
+        return list(self.key_facts)
 
     def get_stats(self) -> dict[str, Any]:
         """
@@ -147,98 +334,102 @@ class InfiniteContextManager:
         Returns:
             Statistics about token usage, compression ratio, etc.
         """
-        total_current_tokens = sum(m["tokens"] for m in self.messages)
-        total_current_tokens += sum(
-            self._estimate_tokens(b["summary"]) for b in self.compressed_blocks
-        )
+        pinned_tokens = sum(m["tokens"] for m in self._pinned)
+        compressed_tokens = self.compressed_tokens
+        total_current_tokens = self.token_count + pinned_tokens + compressed_tokens
+
+        # original_tokens is a fast estimate, so compare it against the fast
+        # estimate of the current context rather than a possibly exact count
+        fast_current_tokens = self._fast_total + pinned_tokens + compressed_tokens
 
         compression_ratio = 0.0
         if self.original_tokens > 0:
-            compression_ratio = (1 - (total_current_tokens / self.original_tokens)) * 100
+            compression_ratio = (1 - (fast_current_tokens / self.original_tokens)) * 100
 
         return {
             "total_messages": self.total_messages,
             "recent_messages": len(self.messages),
+            "pinned_messages": len(self._pinned),
             "compressed_blocks": len(self.compressed_blocks),
             "key_facts": len(self.key_facts),
             "entities_tracked": len(self.entities),
             "original_tokens": self.original_tokens,
             "current_tokens": total_current_tokens,
+            "fast_estimate": fast_current_tokens,
             "compression_ratio": round(compression_ratio, 1),
-            "tokens_saved": self.original_tokens - total_current_tokens,
+            "tokens_saved": self.original_tokens - fast_current_tokens,
             "conversation_turns": self.total_messages // 2,
         }
 
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count (roughly 4 chars = 1 token)."""
-        return len(text) // 4
+        return fast_estimate(text)
 
     def _extract_facts(self, content: str, role: str) -> None:
         """Extract key facts from message content."""
+        timestamp = time.time()
+        for sentence in SENTENCE_SPLIT_PATTERN.split(content):
+            self._add_fact(sentence, role, timestamp)
+
+    def _add_fact(self, sentence: str, role: str, timestamp: float) -> None:
+        """Record a sentence as a key fact if it looks like a factual statement."""
+        sentence = sentence.strip()
+        if self._is_fact(sentence):
+            self.key_facts.append(
+                {
+                    "fact": sentence,
+                    "tokens": self._estimate_tokens(sentence),
+                    "role": role,
+                    "timestamp": timestamp,
+                    "confidence": 0.7,  # Simple baseline confidence
+                }
+            )
+
+    def _is_fact(self, sentence: str) -> bool:
+        """Check whether a (stripped) sentence looks like a factual statement."""
+        if len(sentence) < 20 or len(sentence) > 200:
+            return False
+
         # Simple heuristic: sentences with key indicators
-        fact_indicators = [
-            r"\bis\b",
-            r"\bare\b",
-            r"\bwas\b",
-            r"\bwere\b",
-            r"\bhas\b",
-            r"\bhave\b",
-            r"\bshows\b",
-            r"\bindicates\b",
-            r"\breveals\b",
-            r"\bconfirms\b",
-            r"\bdemonstrates\b",
-        ]
+        return FACT_INDICATOR_PATTERN.search(sentence) is not None
+
+    def _extract_bulk(self, messages: list[dict[str, Any]]) -> None:
+        """Extract facts and entities from a batch of messages in one pass."""
+        # The separator ends a sentence and breaks multi-word entity matches,
+        # so nothing found in the joined text spans two messages.
+        separator = "\n.\n"
+        starts = []
+        offset = 0
+        for message in messages:
+            starts.append(offset)
+            offset += len(message["content"]) + len(separator)
 
-        sentences = re.split(r"[.!?]+", content)
+        joined = separator.join(m["content"] for m in messages)
+        timestamp = time.time()
 
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) < 20 or len(sentence) > 200:
-                continue
+        for match in SENTENCE_PATTERN.finditer(joined):
+            # A message's first sentence match begins on the separator's trailing
+            # newline, before the message start, so locate it by its last char
+            role = messages[bisect_right(starts, match.end() - 1) - 1]["role"]
+            self._add_fact(match.group(), role, timestamp)
 
-            # Check if sentence contains fact indicators
-            for indicator in fact_indicators:
-                if re.search(indicator, sentence, re.IGNORECASE):
-                    self.key_facts.append(
-                        {
-                            "fact": sentence,
-                            "role": role,
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "confidence": 0.7,  # Simple baseline confidence
-                        }
-                    )
-                    break
+        self._extract_entities(joined)
 
     def _extract_entities(self, content: str) -> None:
         """Extract and track named entities."""
-        # Simple capitalized word extraction (can be enhanced with NER)
-        words = re.findall(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b", content)
-
-        # Common words to exclude
-        common_words = {
-            "The",
-            "This",
-            "That",
-            "These",
-            "Those",
-            "When",
-            "Where",
-            "What",
-            "Why",
-            "How",
-            "Which",
-            "Who",
-        }
-
-        for word in words:
-            if word not in common_words and len(word) > 2:
-                self.entities[word] = self.entities.get(word, 0) + 1
+        self.entities.update(self._find_entities(content))
+
+    def _find_entities(self, content: str) -> Iterator[str]:
+        """Yield named entity candidates in content."""
+        return (
+            word
+            for word in ENTITY_PATTERN.findall(content)
+            if word not in COMMON_WORDS and len(word) > 2
+        )
 
     def _get_top_entities(self, limit: int = 10) -> list[dict[str, Any]]:
         """Get most frequently mentioned entities."""
-        sorted_entities = sorted(self.entities.items(), key=lambda x: x[1], reverse=True)
-        return [{"entity": e, "frequency": f} for e, f in sorted_entities[:limit]]
+        return [{"entity": e, "frequency": f} for e, f in self.entities.most_common(limit)]
 
     def _group_into_blocks(self, messages: list[dict]) -> list[list[dict]]:
         """Group messages into conversation blocks."""
@@ -291,27 +482,76 @@ class InfiniteContextManager:
 
         return {
             "summary": summary,
+            "summary_tokens": self._estimate_tokens(summary),
             "message_count": len(block),
             "timestamp_start": block[0]["timestamp"],
             "timestamp_end": block[-1]["timestamp"],
             "original_tokens": sum(m["tokens"] for m in block),
         }
 
+    def _summarize_span(self, messages: list[dict]) -> dict[str, Any]:
+        """Build a structured summary of a span of evicted messages."""
+        user_queries = [m["content"] for m in messages if m["role"] == "user"]
+        assistant_responses = [m["content"] for m in messages if m["role"] == "assistant"]
+
+        facts = []
+        entities: Counter[str] = Counter()
+        for message in messages:
+            if message["role"] not in ("user", "assistant"):
+                continue
+            for sentence in SENTENCE_SPLIT_PATTERN.split(message["content"]):
+                sentence = sentence.strip()
+                if self._is_fact(sentence):
+                    facts.append(sentence)
+            entities.update(self._find_entities(message["content"]))
+
+        # A trailing user message without a reply is still an open question
+        next_steps = []
+        if messages and messages[-1]["role"] == "user":
+            next_steps.append(self._truncate(messages[-1]["content"], 100))
+
+        return {
+            "intent": self._truncate(user_queries[0], 100) if user_queries else "",
+            "facts": facts,
+            "entities": entities,
+            "decisions": (
+                self._extract_key_points(assistant_responses) if assistant_responses else []
+            ),
+            "next_steps": next_steps,
+        }
+
+    def _merge_anchor(self, span: dict[str, Any]) -> None:
+        """Merge a span summary into the persistent anchor summary."""
+        # Intent is set by the first compressed span and kept stable afterwards
+        if not self._anchor["intent"]:
+            self._anchor["intent"] = span["intent"]
+
+        for fact in span["facts"]:
+            fact_hash = hash(fact.lower())
+            if fact_hash not in self._anchor_fact_hashes:
+                self._anchor_fact_hashes.add(fact_hash)
+                self._anchor["facts"].append(fact)
+
+        self._anchor["entities"].update(span["entities"])
+
+        self._anchor["decisions"].extend(span["decisions"])
+        self._anchor["next_steps"] = span["next_steps"]
+
+        # Keep the anchor bounded; the dedupe set follows the retained facts, so it
+        # stays bounded too and a trimmed fact can be added again later
+        self._anchor["facts"] = self._anchor["facts"][-20:]
+        self._anchor_fact_hashes = {hash(fact.lower()) for fact in self._anchor["facts"]}
+        self._anchor["decisions"] = self._anchor["decisions"][-10:]
+
     def _extract_topics(self, queries: list[str]) -> str:
         """Extract main topics from queries."""
         # Simple keyword extraction
         all_text = " ".join(queries).lower()
-        words = re.findall(r"\b\w{4,}\b", all_text)
-
-        # Count word frequency
-        word_freq = {}
-        for word in words:
-            if word not in {"what", "when", "where", "which", "about", "this", "that", "with"}:
-                word_freq[word] = word_freq.get(word, 0) + 1
+        words = TOPIC_WORD_PATTERN.findall(all_text)
 
-        # Get top 3 words
-        top_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:3]
-        return ", ".join([w[0] for w in top_words])
+        # Count word frequency and keep the top 3
+        word_freq = Counter(word for word in words if word not in TOPIC_STOPWORDS)
+        return ", ".join(word for word, _ in word_freq.most_common(3))
 
     def _extract_key_points(self, responses: list[str]) -> list[str]:
         """Extract key points from responses."""
@@ -319,12 +559,12 @@ class InfiniteContextManager:
 
         for response in responses:
             # Look for bullet points or numbered lists
-            bullets = re.findall(r"(?:^|\n)[\*\-\d+\.]\s*([^\n]{20,100})", response)
+            bullets = BULLET_PATTERN.findall(response)
             key_points.extend([b.strip() for b in bullets[:2]])
 
             # Look for sentences with key verbs
             if not bullets:
-                sentences = re.split(r"[.!?]+", response)
+                sentences = SENTENCE_SPLIT_PATTERN.split(response)
                 for sent in sentences[:2]:
                     if len(sent) > 30 and len(sent) < 150:
                         key_points.append(sent.strip())
@@ -342,7 +582,8 @@ class InfiniteContextManager:
         if not self.compressed_blocks:
             return ""
 
-        summaries = [block["summary"] for block in self.compressed_blocks[-5:]]  # Last 5 blocks
+        # Last 5 blocks
+        summaries = [block["summary"] for block in self._last(self.compressed_blocks, 5)]
         return " || ".join(summaries)
 
     def _apply_token_limit(self, context: dict[str, Any], max_tokens: int) -> dict[str, Any]:
@@ -359,19 +600,24 @@ class InfiniteContextManager:
         }
 
         # Always include recent messages (highest priority)
+        # Walk newest first, prepending to deques to keep chronological order
+        recent_messages: deque[dict[str, Any]] = deque()
         for msg in reversed(context["recent_messages"]):
-            msg_tokens = self._estimate_tokens(msg["content"])
+            msg_tokens = msg["tokens"]
             if total_tokens + msg_tokens <= max_tokens * 0.6:  # 60% for recent
-                limited_context["recent_messages"].insert(0, msg)
+                recent_messages.appendleft(msg)
                 total_tokens += msg_tokens
+        limited_context["recent_messages"] = list(recent_messages)
 
         # Add key facts
         remaining = max_tokens - total_tokens
+        key_facts: deque[dict[str, Any]] = deque()
         for fact in reversed(context["key_facts"]):
-            fact_tokens = self._estimate_tokens(fact["fact"])
+            fact_tokens = fact["tokens"]
             if total_tokens + fact_tokens <= max_tokens and fact_tokens < remaining * 0.2:
-                limited_context["key_facts"].insert(0, fact)
+                key_facts.appendleft(fact)
                 total_tokens += fact_tokens
+        limited_context["key_facts"] = list(key_facts)
 
         # Add compressed summary if space allows
         remaining = max_tokens - total_tokens
@@ -23,6 +23,12 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
+# Optional MessagePack encoding for /ws clients that ask for it
+try:
+    import msgpack  # type: ignore[import-not-found]
+except ImportError:
+    msgpack = None
+
 try:
     from searxng_mcp.ai_enhancer import get_ai_enhancer
 
@@ -36,43 +42,82 @@ from searxng_mcp.rtd_manager import RealTimeDataManager
 
 logger = logging.getLogger(__name__)
 
+# ((inode, mtime), parsed values) of the last .env file read by load_config
+_env_cache: tuple[tuple[int, int], dict[str, str]] | None = None
+
+
+def _read_env_file(env_path: Path) -> dict[str, str]:
+    """Parse KEY=VALUE lines from a .env file, re-reading only when it changes."""
+    global _env_cache
+    stat = env_path.stat()
+    version = (stat.st_ino, stat.st_mtime_ns)
+    if _env_cache is not None and _env_cache[0] == version:
+        return _env_cache[1]
+
+    values = {}
+    for line in env_path.read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and "=" in line:
+            key, value = line.split("=", 1)
+            values[key.strip()] = value.strip()
+
+    _env_cache = (version, values)
+    return values
+
 
 # Background task
 async def periodic_health_check():
     """Periodically check instance health and broadcast updates."""
     while True:
         try:
-            results = await manager.check_all_instances()
-            await broadcast_health_update(
-                {
-                    "type": "health_update",
-                    "data": results,
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            )
+            await manager.check_all_instances()
+            manager.broadcast_queue.put_nowait((manager.last_snapshot, manager.last_snapshot_json))
         except Exception as e:
             print(f"Health check error: {e}")
         await asyncio.sleep(30)  # Check every 30 seconds
 
 
+async def broadcast_updates():
+    """Send queued health updates, coalescing any backlog into the newest one."""
+    queue = manager.broadcast_queue
+    while True:
+        snapshot, message = await queue.get()
+        # A newer snapshot supersedes older ones, so slow sends never pile up frames
+        while not queue.empty():
+            snapshot, message = queue.get_nowait()
+        try:
+            await broadcast_health_update(snapshot, message)
+        except Exception as e:
+            logger.error(f"Health broadcast error: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for background tasks."""
     # Startup: start background tasks
     health_task = asyncio.create_task(periodic_health_check())
+    broadcast_task = asyncio.create_task(broadcast_updates())
     cleanup_task = asyncio.create_task(manager._cleanup_sessions())
     yield
     # Shutdown: cancel background tasks
     health_task.cancel()
+    broadcast_task.cancel()
     cleanup_task.cancel()
     try:
         await health_task
     except asyncio.CancelledError:
         pass
+    try:
+        await broadcast_task
+    except asyncio.CancelledError:
+        pass
     try:
         await cleanup_task
     except asyncio.CancelledError:
         pass
+    await manager.client.aclose()
+    if manager.ai_enhancer:
+        await manager.ai_enhancer.aclose()
 
 
 # Initialize FastAPI app with lifespan
@@ -84,7 +129,9 @@ app = FastAPI(
 )
 
 # Store WebSocket connections
-active_connections: list[WebSocket] = []
+active_connections: set[WebSocket] = set()
+# Connections that negotiated MessagePack frames instead of JSON text
+msgpack_connections: set[WebSocket] = set()
 
 
 class InstanceHealth(BaseModel):
@@ -212,10 +259,28 @@ class DashboardManager:
     MAX_SESSIONS = 1000  # Maximum concurrent sessions
     USER_MODEL_INCREMENT_LONG_QUERY = 5  # Increment for queries > 10 words
     USER_MODEL_INCREMENT_RESEARCH = 3  # Increment for research interest
+    MAX_CONNECTIONS = 100  # Pooled connections across all instances
+    MAX_KEEPALIVE_CONNECTIONS = 20  # Idle connections kept open between checks
+    HEALTH_CHECK_PATH = "/healthz"  # SearXNG's static liveness endpoint
+    SNAPSHOT_MAX_AGE_SECONDS = 30  # Reuse the last health snapshot while this fresh
 
     def __init__(self):
         self.load_config()
+        # Shared client so health checks and searches reuse pooled connections
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.MAX_CONNECTIONS,
+                max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
         self.health_history: list[dict] = []
+        # Last health_update message, its JSON encoding, and when it was taken
+        self.last_snapshot: dict | None = None
+        self.last_snapshot_json: str | None = None
+        self.last_snapshot_ts = 0.0
+        # (snapshot, JSON encoding) pairs waiting to be broadcast
+        self.broadcast_queue: asyncio.Queue[tuple[dict, str]] = asyncio.Queue()
         self.search_stats = {"total_searches": 0, "successful_searches": 0, "failed_searches": 0}
         self.chat_sessions: dict[str, ChatSession] = {}
         self.ai_enhancer = get_ai_enhancer() if AI_AVAILABLE else None
@@ -229,12 +294,8 @@ class DashboardManager:
         # Try to load from .env file
         env_path = Path(".env")
         if env_path.exists():
-            with open(env_path) as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#") and "=" in line:
-                        key, value = line.split("=", 1)
-                        os.environ.setdefault(key.strip(), value.strip())
+            for key, value in _read_env_file(env_path).items():
+                os.environ.setdefault(key, value)
 
         # Load instances
         instances_str = os.environ.get("SEARXNG_INSTANCES", "")
@@ -261,33 +322,32 @@ class DashboardManager:
         except ValueError:
             self.local_timeout = 15.0
 
-    async def check_instance(self, instance: str, timeout: float) -> dict:
-        """Check health of a single instance."""
+    async def check_instance(
+        self, instance: str, timeout: float, timestamp: str | None = None
+    ) -> dict:
+        """Check health of a single instance, stamping the result with timestamp."""
         result = {
             "instance": instance,
             "status": "unknown",
             "response_time": None,
             "error": None,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp or datetime.utcnow().isoformat(),
         }
 
-        start_time = time.time()
+        start = time.perf_counter()
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.get(
-                    f"{instance}/search",
-                    params={"q": "test", "format": "json"},
-                )
+            # Liveness probe only; a real search would load the upstream engines
+            response = await self.client.get(f"{instance}{self.HEALTH_CHECK_PATH}", timeout=timeout)
 
-                response_time = time.time() - start_time
-                result["response_time"] = round(response_time, 3)
+            response_time = time.perf_counter() - start
+            result["response_time"] = round(response_time, 3)
 
-                if response.status_code == 200:
-                    result["status"] = "healthy"
-                else:
-                    result["status"] = "unhealthy"
-                    result["error"] = f"HTTP {response.status_code}"
+            if 200 <= response.status_code < 300:
+                result["status"] = "healthy"
+            else:
+                result["status"] = "unhealthy"
+                result["error"] = f"HTTP {response.status_code}"
 
         except httpx.TimeoutException:
             result["status"] = "timeout"
@@ -302,37 +362,57 @@ class DashboardManager:
         return result
 
     async def check_all_instances(self) -> list[dict]:
-        """Check health of all instances."""
+        """Check health of all instances and record the results as the latest snapshot."""
+        # One timestamp for the whole check cycle
+        timestamp = datetime.utcnow().isoformat()
         tasks = []
 
         for instance in self.instances:
-            tasks.append(self.check_instance(instance, self.timeout))
+            tasks.append(self.check_instance(instance, self.timeout, timestamp))
 
         if self.local_instance:
-            tasks.append(self.check_instance(self.local_instance, self.local_timeout))
+            tasks.append(self.check_instance(self.local_instance, self.local_timeout, timestamp))
 
-        results = await asyncio.gather(*tasks)
+        results = list(await asyncio.gather(*tasks))
 
         # Store in history (keep last 100)
-        self.health_history.append({"timestamp": datetime.utcnow().isoformat(), "results": results})
+        self.health_history.append({"timestamp": timestamp, "results": results})
         if len(self.health_history) > 100:
             self.health_history.pop(0)
 
-        return list(results)
+        self.store_snapshot(results, timestamp)
+        return results
+
+    def store_snapshot(self, results: list[dict], timestamp: str) -> dict:
+        """Record health results as the latest health_update message."""
+        self.last_snapshot = {
+            "type": "health_update",
+            "data": results,
+            "timestamp": timestamp,
+        }
+        self.last_snapshot_json = json.dumps(self.last_snapshot)
+        self.last_snapshot_ts = time.monotonic()
+        return self.last_snapshot
+
+    def snapshot_is_fresh(self) -> bool:
+        """Check whether the last health snapshot can be served as-is."""
+        return (
+            self.last_snapshot is not None
+            and time.monotonic() - self.last_snapshot_ts < self.SNAPSHOT_MAX_AGE_SECONDS
+        )
 
     async def search_instance(self, instance: str, query: str, **params) -> dict:
         """Perform search on instance."""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                search_params = {"q": query, "format": "json", **params}
-                response = await client.get(f"{instance}/search", params=search_params)
-
-                if response.status_code == 200:
-                    self.search_stats["successful_searches"] += 1
-                    return {"status": "success", "data": response.json()}
-                else:
-                    self.search_stats["failed_searches"] += 1
-                    return {"status": "error", "error": f"HTTP {response.status_code}"}
+            search_params = {"q": query, "format": "json", **params}
+            response = await self.client.get(f"{instance}/search", params=search_params)
+
+            if response.status_code == 200:
+                self.search_stats["successful_searches"] += 1
+                return {"status": "success", "data": response.json()}
+            else:
+                self.search_stats["failed_searches"] += 1
+                return {"status": "error", "error": f"HTTP {response.status_code}"}
         except Exception as e:
             self.search_stats["failed_searches"] += 1
             return {"status": "error", "error": str(e)}
@@ -432,8 +512,7 @@ class DashboardManager:
             response["rtd_status"] = rtd_status
 
             # Add freshness info to each result
-            for i, result in enumerate(results):
-                freshness = self.rtd_manager.calculate_freshness(result)
+            for result, freshness in zip(results, rtd_status["result_freshness"]):
                 result["freshness"] = freshness
 
             response["search_results"] = results[:10]
@@ -535,14 +614,46 @@ manager = DashboardManager()
 
 
 # WebSocket connection manager
-async def broadcast_health_update(data: dict):
-    """Broadcast health update to all connected clients."""
-    message = json.dumps(data)
-    for connection in active_connections:
-        try:
-            await connection.send_text(message)
-        except Exception:
-            active_connections.remove(connection)
+def _wants_msgpack(websocket: WebSocket) -> bool:
+    """Check whether a /ws client asked for MessagePack frames."""
+    if msgpack is None:
+        return False
+    return (
+        "msgpack" in websocket.scope.get("subprotocols", [])
+        or websocket.query_params.get("format") == "msgpack"
+    )
+
+
+async def send_update(websocket: WebSocket, data: dict, message: str | None = None) -> None:
+    """Send an update to one client in its negotiated format."""
+    if websocket in msgpack_connections:
+        await websocket.send_bytes(msgpack.packb(data, use_bin_type=True))
+    else:
+        await websocket.send_text(message or json.dumps(data))
+
+
+async def broadcast_health_update(data: dict, message: str | None = None):
+    """Broadcast health update to all connected clients, reusing message if encoded."""
+    message = message or json.dumps(data)
+    packed = msgpack.packb(data, use_bin_type=True) if msgpack_connections else None
+
+    # Send to every client concurrently so one slow socket doesn't delay the rest
+    connections = list(active_connections)
+    results = await asyncio.gather(
+        *(
+            (
+                connection.send_bytes(packed)
+                if connection in msgpack_connections
+                else connection.send_text(message)
+            )
+            for connection in connections
+        ),
+        return_exceptions=True,
+    )
+    for connection, result in zip(connections, results):
+        if isinstance(result, Exception):
+            active_connections.discard(connection)
+            msgpack_connections.discard(connection)
 
 
 # API Endpoints
@@ -559,10 +670,17 @@ async def dashboard():
 
 
 @app.get("/api/health")
-async def get_health():
-    """Get current health status of all instances."""
-    results = await manager.check_all_instances()
-    return {"status": "ok", "instances": results, "timestamp": datetime.utcnow().isoformat()}
+async def get_health(force: bool = False):
+    """
+    Get current health status of all instances.
+
+    Serves the last periodic check while it is fresh; pass force=true to
+    check every instance now.
+    """
+    if force or not manager.snapshot_is_fresh():
+        await manager.check_all_instances()
+    snapshot = manager.last_snapshot
+    return {"status": "ok", "instances": snapshot["data"], "timestamp": snapshot["timestamp"]}
 
 
 @app.get("/api/config")
@@ -799,30 +917,40 @@ async def chat_websocket(websocket: WebSocket):
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time updates."""
-    await websocket.accept()
-    active_connections.append(websocket)
+    """
+    WebSocket endpoint for real-time updates.
+
+    Sends JSON text frames by default. Clients that request the "msgpack"
+    subprotocol or connect with ?format=msgpack get MessagePack binary frames
+    instead when msgpack is installed.
+    """
+    binary = _wants_msgpack(websocket)
+    subprotocols = websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol="msgpack" if binary and "msgpack" in subprotocols else None)
+    active_connections.add(websocket)
+    if binary:
+        msgpack_connections.add(websocket)
 
     try:
-        # Send initial data
-        results = await manager.check_all_instances()
-        await websocket.send_text(
-            json.dumps(
-                {
-                    "type": "health_update",
-                    "data": results,
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            )
-        )
+        # Send initial data, reusing the last periodic check when it is recent
+        if not manager.snapshot_is_fresh():
+            await manager.check_all_instances()
+        await send_update(websocket, manager.last_snapshot, manager.last_snapshot_json)
 
-        # Keep connection alive
+        # Keep connection alive, echoing each frame back in the type it arrived as
         while True:
-            data = await websocket.receive_text()
-            # Echo back or handle commands
-            await websocket.send_text(data)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                await websocket.send_bytes(message["bytes"])
+            elif message.get("text") is not None:
+                await websocket.send_text(message["text"])
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
+        pass
+    finally:
+        active_connections.discard(websocket)
+        msgpack_connections.discard(websocket)
 
 
 # Mount static files
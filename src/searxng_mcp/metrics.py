@@ -5,7 +5,6 @@ Tracks requests, costs, latency, errors, and provider usage for monitoring and o
 Respects user privacy preferences - can be fully disabled.
 """
 
-import json
 import logging
 import os
 import time
@@ -14,6 +13,22 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+# Metrics files are compact UTF-8 JSON bytes; orjson when installed
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes, matching orjson.dumps."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -267,19 +282,24 @@ class MetricsCollector:
         cutoff_date = datetime.now() - timedelta(days=days)
 
         try:
-            for metrics_file in sorted(self.metrics_dir.glob("metrics_*.json")):
+            with os.scandir(self.metrics_dir) as entries:
+                names = sorted(
+                    entry.name
+                    for entry in entries
+                    if entry.name.startswith("metrics_") and entry.name.endswith(".json")
+                )
+
+            for name in names:
                 try:
                     # Parse date from filename
-                    date_str = metrics_file.stem.replace("metrics_", "")
+                    date_str = name[len("metrics_") : -len(".json")]
                     file_date = datetime.strptime(date_str, "%Y%m%d")
 
                     if file_date >= cutoff_date:
-                        with open(metrics_file, encoding="utf-8") as f:
-                            data = json.load(f)
-                            historical_data.append(data)
+                        historical_data.append(_loads((self.metrics_dir / name).read_bytes()))
 
                 except Exception as e:
-                    logger.warning(f"Error reading metrics file {metrics_file.name}: {e}")
+                    logger.warning(f"Error reading metrics file {name}: {e}")
 
             # Aggregate historical data
             total_requests = sum(d.get("requests", {}).get("total", 0) for d in historical_data)
@@ -309,8 +329,7 @@ class MetricsCollector:
 
             # Load existing metrics for today if available
             if metrics_file.exists():
-                with open(metrics_file, encoding="utf-8") as f:
-                    existing_metrics = json.load(f)
+                existing_metrics = _loads(metrics_file.read_bytes())
             else:
                 existing_metrics = None
 
@@ -340,8 +359,7 @@ class MetricsCollector:
             merged_metrics["date"] = date_str
 
             # Write to file
-            with open(metrics_file, "w", encoding="utf-8") as f:
-                json.dump(merged_metrics, f, indent=2, ensure_ascii=False)
+            metrics_file.write_bytes(_dumps(merged_metrics))
 
             logger.debug(f"Persisted metrics to {metrics_file.name}")
 
@@ -9,12 +9,16 @@ Enables truly infinite context with zero information loss - makes the model roar
 """
 
 import ast
+import builtins
+import heapq
 import logging
 import re
 import time
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, wraps
+from types import CodeType
 from typing import Any
 
 try:
@@ -31,6 +35,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Word tokenizer shared by the inverted index and find_messages() lookups
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Keywords made only of plain words can be answered from the inverted index
+PLAIN_KEYWORD_PATTERN = re.compile(r"[A-Za-z0-9]+(?:\s+[A-Za-z0-9]+)*")
+
 
 # Security decorators
 def timeout_limit(seconds: int) -> Any:
@@ -91,6 +101,215 @@ class REPLSecurityError(Exception):
     pass
 
 
+# Functions REPL code may call: the registered REPL functions plus safe builtins
+ALLOWED_CALLS = frozenset(
+    {
+        # REPL functions
+        "find_messages",
+        "filter_by_date",
+        "filter_by_role",
+        "grep",
+        "search_semantic",
+        "summarize_range",
+        "aggregate_facts",
+        "extract_entities",
+        "get_timeline",
+        "analyze_subsection",
+        "parallel_analyze",
+        "count_messages",
+        "get_topics",
+        "get_message",
+        "slice_messages",
+        # Builtins
+        "len",
+        "str",
+        "int",
+        "float",
+        "bool",
+        "list",
+        "dict",
+        "set",
+        "tuple",
+        "range",
+        "enumerate",
+        "zip",
+        "reversed",
+        "sorted",
+        "min",
+        "max",
+        "sum",
+        "abs",
+        "round",
+        "any",
+        "all",
+    }
+)
+
+
+# Names a snippet may never rebind, or a whitelisted call name could reach
+# something else (e.g. ``len = exec`` or ``def open(): ...``)
+PROTECTED_NAMES = ALLOWED_CALLS | frozenset(dir(builtins))
+
+# Builtins a snippet may not even mention, since a reference can be called
+# indirectly (e.g. ``[eval][0]("...")``)
+FORBIDDEN_BUILTINS = frozenset(dir(builtins)) - ALLOWED_CALLS
+
+# Frame, code and traceback attributes that lead back to real globals/builtins
+FORBIDDEN_ATTRIBUTES = frozenset(
+    {
+        "gi_frame",
+        "gi_code",
+        "gi_yieldfrom",
+        "cr_frame",
+        "cr_code",
+        "cr_await",
+        "ag_frame",
+        "ag_code",
+        "ag_await",
+        "f_globals",
+        "f_locals",
+        "f_builtins",
+        "f_back",
+        "f_code",
+        "tb_frame",
+        "tb_next",
+    }
+)
+
+# The only builtins available to fallback execution
+SAFE_BUILTINS = {name: getattr(builtins, name) for name in ALLOWED_CALLS if hasattr(builtins, name)}
+
+
+class _SafeVisitor(ast.NodeVisitor):
+    """AST whitelist validator for REPL code."""
+
+    def __init__(self, tree: ast.Module):
+        # Functions defined at the snippet's top level may be called too; like the
+        # whitelisted names, nothing else in the snippet may rebind them
+        self.local_functions = {
+            node.name for node in tree.body if isinstance(node, ast.FunctionDef)
+        }
+        self.allowed_calls = ALLOWED_CALLS | self.local_functions
+        self.protected = PROTECTED_NAMES | self.local_functions
+
+    def _check_binding(self, name: str | None) -> None:
+        """Reject binding a name that calls are checked against."""
+        if name is not None and (name.startswith("__") or name in self.protected):
+            raise REPLSecurityError(f"Rebinding protected name not allowed: {name}")
+
+    def _check_definition(self, node: ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef):
+        """Reject definitions that shadow a builtin or whitelisted function."""
+        # Another def of a local function name is fine, its body is checked too
+        protected = PROTECTED_NAMES if isinstance(node, ast.FunctionDef) else self.protected
+        if node.name.startswith("__") or node.name in protected:
+            raise REPLSecurityError(f"Definition shadowing protected name not allowed: {node.name}")
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._check_definition(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._check_definition(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._check_definition(node)
+
+    def visit_arg(self, node: ast.arg) -> None:
+        self._check_binding(node.arg)
+        self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        self._check_binding(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchAs(self, node: ast.MatchAs) -> None:
+        self._check_binding(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchStar(self, node: ast.MatchStar) -> None:
+        self._check_binding(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchMapping(self, node: ast.MatchMapping) -> None:
+        self._check_binding(node.rest)
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        raise REPLSecurityError("Imports are not allowed")
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        raise REPLSecurityError("Imports are not allowed")
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if node.attr.startswith("__"):
+            raise REPLSecurityError(f"Access to dunder attribute not allowed: {node.attr}")
+        if node.attr in FORBIDDEN_ATTRIBUTES:
+            raise REPLSecurityError(f"Access to attribute not allowed: {node.attr}")
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if node.id.startswith("__"):
+            raise REPLSecurityError(f"Access to dunder name not allowed: {node.id}")
+        if not isinstance(node.ctx, ast.Load):
+            self._check_binding(node.id)
+        elif node.id in FORBIDDEN_BUILTINS:
+            raise REPLSecurityError(f"Access to builtin not allowed: {node.id}")
+
+    def visit_Global(self, node: ast.Global) -> None:
+        for name in node.names:
+            self._check_binding(name)
+
+    def visit_Nonlocal(self, node: ast.Nonlocal) -> None:
+        for name in node.names:
+            self._check_binding(name)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        # Only whitelisted names and method calls; anything else (a subscript, a
+        # call result, a lambda) could evaluate to an arbitrary callable
+        if isinstance(node.func, ast.Name):
+            if node.func.id not in self.allowed_calls:
+                raise REPLSecurityError(f"Call to function not allowed: {node.func.id}")
+        elif not isinstance(node.func, ast.Attribute):
+            raise REPLSecurityError("Only named functions and methods may be called")
+        self.generic_visit(node)
+
+
+def _parse_and_check(code: str) -> ast.Module:
+    """Parse code and validate it against the AST whitelist."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        raise REPLSecurityError(f"Invalid Python syntax: {e}")
+
+    _SafeVisitor(tree).visit(tree)
+    return tree
+
+
+@lru_cache(maxsize=512)
+def _compile_and_check(code: str) -> tuple[CodeType | None, Exception | None]:
+    """
+    Security-check and compile a snippet once.
+
+    Both outcomes are cached, so repeated snippets skip parsing, validation and
+    compilation, and blocked snippets stay blocked.
+
+    Returns:
+        Tuple of (compiled code, None) or (None, error to raise)
+    """
+    try:
+        tree = _parse_and_check(code)
+
+        if RESTRICTED_PYTHON_AVAILABLE:
+            compile_result = compile_restricted_exec(tree, filename="<string>")
+            if compile_result.errors:
+                raise REPLExecutionError(f"Compilation errors: {compile_result.errors}")
+            return compile_result.code, None
+
+        return compile(tree, "<string>", "exec"), None
+    except (REPLSecurityError, REPLExecutionError) as e:
+        return None, e
+
+
 class RLMREPLManager:
     """
     Recursive Language Model REPL Manager
@@ -126,7 +345,7 @@ class RLMREPLManager:
         self.context = {
             "messages": [],  # All conversation messages
             "facts": [],  # Extracted facts
-            "entities": {},  # Named entities with frequencies
+            "entities": Counter(),  # Named entities with frequencies
             "timeline": [],  # Chronological events
             "summaries": {},  # Cached summaries by range
             "metadata": {  # Conversation metadata
@@ -149,6 +368,16 @@ class RLMREPLManager:
         # Recursion tracking
         self.current_recursion_depth = 0
 
+        # Bumped on every new message; cached range summaries are keyed by it
+        self._version = 0
+        self._summaries_version = 0
+
+        # Inverted index: lowercased word -> ids of messages containing it
+        self._inverted: defaultdict[str, set[int]] = defaultdict(set)
+        # Messages with non-ASCII text, where re.IGNORECASE can match characters
+        # that lower() does not map to the indexed ASCII words (e.g. "ſ" ~ "s")
+        self._non_ascii_ids: set[int] = set()
+
         # Safe function registry
         self._register_safe_functions()
 
@@ -205,6 +434,11 @@ class RLMREPLManager:
         }
 
         self.context["messages"].append(message)
+        self._version += 1
+        for token in set(WORD_PATTERN.findall(content.lower())):
+            self._inverted[token].add(message["id"])
+        if not content.isascii():
+            self._non_ascii_ids.add(message["id"])
         self.context["metadata"]["total_turns"] = len(self.context["messages"]) // 2
 
         # Extract and store facts/entities automatically
@@ -242,14 +476,16 @@ class RLMREPLManager:
         self.stats["executions"] += 1
 
         try:
-            # Security validation
-            self._validate_code_security(code)
+            # Security validation and compilation (cached per snippet)
+            code_obj, error = _compile_and_check(code)
+            if error is not None:
+                raise type(error)(*error.args)
 
             # Execute in restricted environment
             if RESTRICTED_PYTHON_AVAILABLE:
-                result = self._execute_restricted(code)
+                result = self._execute_restricted(code_obj)
             else:
-                result = self._execute_fallback(code)
+                result = self._execute_fallback(code_obj)
 
             execution_time = time.time() - start_time
             self.stats["successful"] += 1
@@ -283,43 +519,10 @@ class RLMREPLManager:
 
     def _validate_code_security(self, code: str):
         """Validate code for security issues."""
-        # Block dangerous imports
-        dangerous_imports = [
-            "os",
-            "sys",
-            "subprocess",
-            "eval",
-            "exec",
-            "compile",
-            "__import__",
-            "open",
-            "file",
-        ]
-
-        for danger in dangerous_imports:
-            if danger in code:
-                raise REPLSecurityError(f"Dangerous operation detected: {danger}")
-
-        # Block file operations
-        dangerous_ops = ["open(", "file(", "write(", "read("]
-        for op in dangerous_ops:
-            if op in code:
-                raise REPLSecurityError(f"File operation not allowed: {op}")
-
-        # Validate syntax
-        try:
-            ast.parse(code)
-        except SyntaxError as e:
-            raise REPLSecurityError(f"Invalid Python syntax: {e}")
-
-    def _execute_restricted(self, code: str) -> Any:
-        """Execute code with RestrictedPython."""
-        # Compile with restrictions
-        compile_result = compile_restricted_exec(code, filename="<string>")
-
-        if compile_result.errors:
-            raise REPLExecutionError(f"Compilation errors: {compile_result.errors}")
+        _parse_and_check(code)
 
+    def _execute_restricted(self, code_obj: CodeType) -> Any:
+        """Execute code compiled with RestrictedPython."""
         # Build safe globals with all required guards
         safe_globals_dict = {
             "__builtins__": safe_builtins,
@@ -331,23 +534,25 @@ class RLMREPLManager:
         }
 
         # Execute
-        exec(compile_result.code, safe_globals_dict)
+        exec(code_obj, safe_globals_dict)
 
         # Return result if stored in 'result' variable
         return safe_globals_dict.get("result", None)
 
-    def _execute_fallback(self, code: str) -> Any:
+    def _execute_fallback(self, code_obj: CodeType) -> Any:
         """Fallback execution without RestrictedPython (less safe)."""
         logger.warning("Using fallback execution - security is limited!")
 
-        # Build namespace
+        # Build namespace; without an explicit __builtins__, exec() would add the
+        # full builtins module
         namespace = {
+            "__builtins__": dict(SAFE_BUILTINS),
             "context": self.context,
             **self.safe_functions,
         }
 
         # Execute
-        exec(code, namespace)
+        exec(code_obj, namespace)
 
         return namespace.get("result", None)
 
@@ -356,17 +561,33 @@ class RLMREPLManager:
     @timeout_limit(2)
     @memory_limit(1000)
     def _find_messages(self, keyword: str, case_sensitive: bool = False) -> list[dict]:
-        """Find messages containing keyword."""
-        results = []
-        pattern = re.compile(
-            keyword if case_sensitive else keyword, 0 if case_sensitive else re.IGNORECASE
-        )
+        """
+        Find messages containing keyword.
 
-        for msg in self.context["messages"]:
-            if pattern.search(msg["content"]):
-                results.append(msg)
+        Case-insensitive plain-word keywords use the inverted index to narrow
+        down candidates, which are then confirmed with the same regex search as
+        other keywords, so results match a full scan exactly.
+        """
+        pattern = re.compile(keyword, 0 if case_sensitive else re.IGNORECASE)
+        messages = self.context["messages"]
 
-        return results
+        if case_sensitive or not PLAIN_KEYWORD_PATTERN.fullmatch(keyword):
+            return [msg for msg in messages if pattern.search(msg["content"])]
+
+        # Each keyword word sits inside some indexed word of a matching message
+        candidates = set.intersection(
+            *(self._substring_postings(token) for token in WORD_PATTERN.findall(keyword.lower()))
+        )
+        candidates |= self._non_ascii_ids
+        return [messages[i] for i in sorted(candidates) if pattern.search(messages[i]["content"])]
+
+    def _substring_postings(self, term: str) -> set[int]:
+        """Get ids of messages with an indexed word containing term."""
+        postings: set[int] = set()
+        for word, ids in self._inverted.items():
+            if term in word:
+                postings |= ids
+        return postings
 
     @timeout_limit(2)
     @memory_limit(1000)
@@ -404,56 +625,124 @@ class RLMREPLManager:
         """
         Semantic search using simple keyword matching and relevance scoring.
         Can be enhanced with embeddings in future.
+
+        A message scores one point per query term found anywhere in its text.
+        Plain-word terms are looked up in the inverted index (any indexed word
+        containing the term), so only messages sharing a substring are touched;
+        other terms fall back to scanning.
         """
         query_terms = set(query.lower().split())
-        scored_messages = []
+        messages = self.context["messages"]
 
-        for msg in self.context["messages"]:
-            content_lower = msg["content"].lower()
-            # Calculate relevance score
-            score = sum(1 for term in query_terms if term in content_lower)
-            if score > 0:
-                scored_messages.append((score, msg))
+        # Relevance score per message id
+        scores: Counter[int] = Counter()
+        for term in query_terms:
+            if WORD_PATTERN.fullmatch(term):
+                scores.update(self._substring_postings(term))
+            else:
+                scores.update(msg["id"] for msg in messages if term in msg["content"].lower())
 
-        # Sort by score and return top k
-        scored_messages.sort(reverse=True, key=lambda x: x[0])
-        return [msg for score, msg in scored_messages[:top_k]]
+        # Top k by score, ties in conversation order
+        top = heapq.nlargest(top_k, sorted(scores), key=scores.__getitem__)
+        return [messages[msg_id] for msg_id in top]
 
     # ==== Aggregation Functions ====
 
     @timeout_limit(3)
     def _summarize_range(self, start_idx: int, end_idx: int) -> str:
         """Summarize a range of messages."""
-        cache_key = f"{start_idx}:{end_idx}"
+        parts = self._get_range_parts(start_idx, end_idx)
+        if parts is None:
+            return "No messages in range"
+        return parts["summary"]
 
-        # Check cache
-        if cache_key in self.context["summaries"]:
-            return self.context["summaries"][cache_key]
+    def _get_range_parts(self, start_idx: int, end_idx: int) -> dict[str, Any] | None:
+        """
+        Get the cached summary parts for a range, computing them if needed.
 
+        Entries are keyed by (start, end, version), so any new message invalidates
+        them. A range whose two halves are already cached is composed from them
+        instead of re-reading the raw messages.
+        """
+        summaries = self.context["summaries"]
+
+        # Drop entries left over from older conversation versions
+        if self._summaries_version != self._version:
+            summaries.clear()
+            self._summaries_version = self._version
+
+        cache_key = (start_idx, end_idx, self._version)
+        if cache_key in summaries:
+            return summaries[cache_key]
+
+        parts = self._compose_range_parts(start_idx, end_idx)
+        if parts is None:
+            parts = self._compute_range_parts(start_idx, end_idx)
+        if parts is not None:
+            summaries[cache_key] = parts
+        return parts
+
+    def _compute_range_parts(self, start_idx: int, end_idx: int) -> dict[str, Any] | None:
+        """Build summary parts for a range from the raw messages."""
         messages = self.context["messages"][start_idx:end_idx]
 
         if not messages:
-            return "No messages in range"
+            return None
 
         # Simple extractive summary
         user_msgs = [m for m in messages if m["role"] == "user"]
         assistant_msgs = [m for m in messages if m["role"] == "assistant"]
 
+        return self._build_range_parts(
+            self._count_topic_words(user_msgs),
+            self._extract_key_points(assistant_msgs),
+            bool(user_msgs),
+            bool(assistant_msgs),
+        )
+
+    def _compose_range_parts(self, start_idx: int, end_idx: int) -> dict[str, Any] | None:
+        """Compose summary parts for a range from two cached adjacent sub-ranges."""
+        if not 0 <= start_idx < end_idx <= len(self.context["messages"]):
+            return None
+
+        summaries = self.context["summaries"]
+        for start, mid, version in list(summaries):
+            if start != start_idx or version != self._version or not start < mid < end_idx:
+                continue
+
+            right = summaries.get((mid, end_idx, version))
+            if right is None:
+                continue
+
+            left = summaries[(start, mid, version)]
+            return self._build_range_parts(
+                left["topic_freq"] + right["topic_freq"],
+                (left["key_points"] + right["key_points"])[:10],
+                left["has_user"] or right["has_user"],
+                left["has_assistant"] or right["has_assistant"],
+            )
+
+        return None
+
+    def _build_range_parts(
+        self, topic_freq: Counter, key_points: list[str], has_user: bool, has_assistant: bool
+    ) -> dict[str, Any]:
+        """Build summary parts (and summary text) from topic counts and key points."""
         summary_parts = []
-        if user_msgs:
-            topics = self._extract_topics_from_messages(user_msgs)
+        if has_user:
+            topics = self._top_topics(topic_freq)
             summary_parts.append(f"User asked about: {', '.join(topics[:5])}")
 
-        if assistant_msgs:
-            key_points = self._extract_key_points(assistant_msgs)
+        if has_assistant:
             summary_parts.append(f"Discussed: {', '.join(key_points[:5])}")
 
-        summary = " | ".join(summary_parts)
-
-        # Cache it
-        self.context["summaries"][cache_key] = summary
-
-        return summary
+        return {
+            "summary": " | ".join(summary_parts),
+            "topic_freq": topic_freq,
+            "key_points": key_points,
+            "has_user": has_user,
+            "has_assistant": has_assistant,
+        }
 
     @timeout_limit(2)
     def _aggregate_facts(self) -> list[dict]:
@@ -480,42 +769,68 @@ class RLMREPLManager:
         This is where the magic happens - LLM can call itself!
         """
         if self.current_recursion_depth >= self.max_recursion_depth:
-            return {
-                "error": f"Maximum recursion depth ({self.max_recursion_depth}) reached",
-                "depth": self.current_recursion_depth,
-            }
+            return self._recursion_limit_error()
 
         self.current_recursion_depth += 1
         self.stats["recursive_calls"] += 1
 
         try:
-            # Simulate recursive LLM call
-            # In real implementation, this would call the actual LLM
-            analysis = {
-                "subsection_size": len(messages),
-                "summary": self._summarize_messages(messages),
-                "key_topics": self._extract_topics_from_messages(messages),
-                "depth": self.current_recursion_depth,
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-
-            return analysis
+            return self._build_analysis(messages, self.current_recursion_depth)
         finally:
             self.current_recursion_depth -= 1
 
     def _parallel_analyze(self, message_ranges: list[tuple[int, int]]) -> list[dict[str, Any]]:
         """
-        Analyze multiple message ranges in parallel (simulated).
-        In production, this would use actual parallel LLM calls.
+        Analyze multiple message ranges in parallel.
+
+        Each range is analyzed on a worker thread, standing in for concurrent
+        sub-LLM calls. All ranges are siblings at the same recursion depth.
         """
-        results = []
+        ranges = message_ranges[:10]  # Limit to 10 ranges
+        if not ranges:
+            return []
 
-        for start, end in message_ranges[:10]:  # Limit to 10 ranges
-            messages = self.context["messages"][start:end]
-            analysis = self._analyze_subsection(messages)
-            results.append({"range": (start, end), "analysis": analysis})
+        if self.current_recursion_depth >= self.max_recursion_depth:
+            error = self._recursion_limit_error()
+            return [{"range": (start, end), "analysis": error} for start, end in ranges]
 
-        return results
+        self.current_recursion_depth += 1
+        self.stats["recursive_calls"] += len(ranges)
+        depth = self.current_recursion_depth
+
+        try:
+            messages = self.context["messages"]
+            # Workers only read their own slice, so no shared state needs locking
+            with ThreadPoolExecutor(max_workers=min(8, len(ranges))) as executor:
+                futures = [
+                    executor.submit(self._build_analysis, messages[start:end], depth)
+                    for start, end in ranges
+                ]
+                return [
+                    {"range": (start, end), "analysis": future.result()}
+                    for (start, end), future in zip(ranges, futures)
+                ]
+        finally:
+            self.current_recursion_depth -= 1
+
+    def _build_analysis(self, messages: list[dict], depth: int) -> dict[str, Any]:
+        """Analyze a subsection (pure; safe to run on worker threads)."""
+        # Simulate recursive LLM call
+        # In real implementation, this would call the actual LLM
+        return {
+            "subsection_size": len(messages),
+            "summary": self._summarize_messages(messages),
+            "key_topics": self._extract_topics_from_messages(messages),
+            "depth": depth,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    def _recursion_limit_error(self) -> dict[str, Any]:
+        """Build the result returned when the recursion limit is reached."""
+        return {
+            "error": f"Maximum recursion depth ({self.max_recursion_depth}) reached",
+            "depth": self.current_recursion_depth,
+        }
 
     # ==== Utility Functions ====
 
@@ -600,7 +915,7 @@ class RLMREPLManager:
 
         for word in words:
             if word not in common_words and len(word) > 2:
-                self.context["entities"][word] = self.context["entities"].get(word, 0) + 1
+                self.context["entities"][word] += 1
 
     def _auto_extract_topics(self, content: str):
         """Automatically extract and count topics."""
@@ -628,7 +943,11 @@ class RLMREPLManager:
 
     def _extract_topics_from_messages(self, messages: list[dict]) -> list[str]:
         """Extract main topics from a list of messages."""
-        word_freq = defaultdict(int)
+        return self._top_topics(self._count_topic_words(messages))
+
+    def _count_topic_words(self, messages: list[dict]) -> Counter:
+        """Count candidate topic words across messages."""
+        word_freq: Counter[str] = Counter()
 
         for msg in messages:
             words = re.findall(r"\b\w{4,}\b", msg["content"].lower())
@@ -636,8 +955,11 @@ class RLMREPLManager:
                 if word not in {"this", "that", "with", "from", "have"}:
                     word_freq[word] += 1
 
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, freq in sorted_words[:10]]
+        return word_freq
+
+    def _top_topics(self, word_freq: Counter) -> list[str]:
+        """Get the 10 most frequent topic words."""
+        return [word for word, freq in word_freq.most_common(10)]
 
     def _extract_key_points(self, messages: list[dict]) -> list[str]:
         """Extract key points from messages."""
@@ -665,9 +987,7 @@ class RLMREPLManager:
         return {
             "messages": self.context["messages"][-50:],  # Last 50 messages
             "facts": self.context["facts"][-20:],
-            "entities": dict(
-                sorted(self.context["entities"].items(), key=lambda x: x[1], reverse=True)[:20]
-            ),
+            "entities": dict(self.context["entities"].most_common(20)),
             "timeline": self.context["timeline"][-30:],
             "metadata": self.context["metadata"],
             "stats": self.get_stats(),
@@ -733,10 +1053,12 @@ class RLMREPLManager:
 
     def reset(self):
         """Reset REPL state (dangerous - use with caution)."""
+        self._inverted.clear()
+        self._non_ascii_ids.clear()
         self.context = {
             "messages": [],
             "facts": [],
-            "entities": {},
+            "entities": Counter(),
             "timeline": [],
             "summaries": {},
             "metadata": {
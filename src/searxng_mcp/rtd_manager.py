@@ -5,13 +5,126 @@ Calculates data freshness, determines refresh needs, and manages
 auto-refresh intervals for time-sensitive queries.
 """
 
+import asyncio
 import logging
 import re
-from datetime import datetime
+from bisect import bisect_right
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Badge and status for each freshness band, indexed by bisecting the
+# ascending FRESHNESS_THRESHOLDS values
+FRESHNESS_BADGES = (
+    ("🔴 LIVE", "live"),
+    ("🟢 FRESH", "fresh"),
+    ("🟡 RECENT", "recent"),
+    ("🟠 STALE", "stale"),
+    ("⚪ OLD", "old"),
+)
+
+# Time-sensitive keywords
+TIME_SENSITIVE_KEYWORDS = [
+    "now",
+    "current",
+    "today",
+    "latest",
+    "recent",
+    "breaking",
+    "live",
+    "real-time",
+    "update",
+    "news",
+    "price",
+    "stock",
+    "weather",
+    "traffic",
+    "score",
+    "trending",
+    "status",
+    "happening",
+    "ongoing",
+    "active",
+    "emergency",
+]
+
+# High-freshness categories
+HIGH_FRESHNESS_CATEGORIES = ["news", "social", "finance", "sports", "weather"]
+
+# Date references (today, this week, etc.)
+DATE_PATTERNS = [
+    r"\btoday\b",
+    r"\bthis\s+(?:week|month|year)\b",
+    r"\b(?:this|last)\s+(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
+    r"\b\d{4}\b",  # Year
+]
+
+# Substring keywords for query type classification, checked in this order
+LIVE_KEYWORDS = ["live", "real-time", "now", "current", "streaming", "score"]
+DYNAMIC_KEYWORDS = [
+    "news",
+    "breaking",
+    "latest",
+    "update",
+    "trending",
+    "price",
+    "stock",
+    "weather",
+    "traffic",
+]
+STATIC_KEYWORDS = [
+    "history",
+    "definition",
+    "biography",
+    "meaning",
+    "what is",
+    "who is",
+    "who was",
+    "when was",
+]
+
+TIME_SENSITIVE_PATTERN = re.compile(
+    "|".join(
+        [r"\b(?:" + "|".join(map(re.escape, TIME_SENSITIVE_KEYWORDS)) + r")\b"] + DATE_PATTERNS
+    )
+)
+LIVE_PATTERN = re.compile("|".join(map(re.escape, LIVE_KEYWORDS)))
+DYNAMIC_PATTERN = re.compile("|".join(map(re.escape, DYNAMIC_KEYWORDS)))
+STATIC_PATTERN = re.compile("|".join(map(re.escape, STATIC_KEYWORDS)))
+
+
+@lru_cache(maxsize=4096)
+def _classify(query_lower: str, category_lower: str) -> tuple[bool, str]:
+    """
+    Classify a lowercased query and category.
+
+    Returns:
+        Tuple of (is_time_sensitive, query_type) where query_type is
+        'live', 'dynamic', 'regular', or 'static'
+    """
+    is_sensitive = (
+        TIME_SENSITIVE_PATTERN.search(query_lower) is not None
+        or category_lower in HIGH_FRESHNESS_CATEGORIES
+    )
+
+    if LIVE_PATTERN.search(query_lower):
+        query_type = "live"
+    elif DYNAMIC_PATTERN.search(query_lower):
+        query_type = "dynamic"
+    elif category_lower in ("news", "social"):
+        query_type = "dynamic"
+    elif category_lower in ("finance", "weather", "sports"):
+        query_type = "live"
+    elif STATIC_PATTERN.search(query_lower):
+        query_type = "static"
+    else:
+        query_type = "regular"
+
+    return is_sensitive, query_type
+
 
 class RealTimeDataManager:
     """
@@ -25,32 +138,10 @@ class RealTimeDataManager:
     """
 
     # Time-sensitive keywords
-    TIME_SENSITIVE_KEYWORDS = [
-        "now",
-        "current",
-        "today",
-        "latest",
-        "recent",
-        "breaking",
-        "live",
-        "real-time",
-        "update",
-        "news",
-        "price",
-        "stock",
-        "weather",
-        "traffic",
-        "score",
-        "trending",
-        "status",
-        "happening",
-        "ongoing",
-        "active",
-        "emergency",
-    ]
+    TIME_SENSITIVE_KEYWORDS = TIME_SENSITIVE_KEYWORDS
 
     # High-freshness categories
-    HIGH_FRESHNESS_CATEGORIES = ["news", "social", "finance", "sports", "weather"]
+    HIGH_FRESHNESS_CATEGORIES = HIGH_FRESHNESS_CATEGORIES
 
     # Freshness thresholds (in seconds)
     FRESHNESS_THRESHOLDS = {
@@ -69,10 +160,21 @@ class RealTimeDataManager:
         "static": 3600,  # 1 hour for static content
     }
 
+    # How long cached results may still be served while revalidating (seconds)
+    STALE_OK_SECONDS = {
+        "live": 600,  # 10 minutes
+        "dynamic": 3600,  # 1 hour
+        "regular": 21600,  # 6 hours
+        "static": 259200,  # 3 days
+    }
+
+    _THRESHOLD_BOUNDS = tuple(FRESHNESS_THRESHOLDS.values())
+
     def __init__(self):
         """Initialize the RTD manager."""
         self.query_cache: dict[str, dict[str, Any]] = {}
         self.refresh_timers: dict[str, datetime] = {}
+        self._revalidating: dict[str, asyncio.Task] = {}
 
     def calculate_freshness(
         self, result: dict[str, Any], query_time: datetime | None = None
@@ -90,7 +192,28 @@ class RealTimeDataManager:
         if query_time is None:
             query_time = datetime.utcnow()
 
-        # Extract timestamp from result
+        return self._freshness_at(result, query_time)
+
+    def calculate_freshness_batch(
+        self, results: list[dict[str, Any]], query_time: datetime | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Calculate freshness for a list of results against one query time.
+
+        Args:
+            results: Search results with timestamp or publishedDate
+            query_time: Time of query (default: now)
+
+        Returns:
+            List of freshness dicts, in the same order as results
+        """
+        if query_time is None:
+            query_time = datetime.utcnow()
+
+        return [self._freshness_at(result, query_time) for result in results]
+
+    def _freshness_at(self, result: dict[str, Any], query_time: datetime) -> dict[str, Any]:
+        """Build the freshness dict for one result."""
         timestamp = self._extract_timestamp(result)
 
         if not timestamp:
@@ -102,23 +225,14 @@ class RealTimeDataManager:
                 "status": "unknown",
             }
 
-        # Calculate age
         age_seconds = (query_time - timestamp).total_seconds()
-
-        # Calculate freshness score (0-100)
-        score = self._calculate_score(age_seconds)
-
-        # Determine badge and status
         badge, status = self._get_badge_and_status(age_seconds)
 
-        # Format age display
-        age_display = self._format_age(age_seconds)
-
         return {
-            "score": score,
+            "score": self._calculate_score(age_seconds),
             "badge": badge,
             "age_seconds": age_seconds,
-            "age_display": age_display,
+            "age_display": self._format_age(age_seconds),
             "status": status,
             "timestamp": timestamp.isoformat(),
         }
@@ -193,30 +307,7 @@ class RealTimeDataManager:
         Returns:
             True if time-sensitive
         """
-        query_lower = query.lower()
-
-        # Check keywords
-        for keyword in self.TIME_SENSITIVE_KEYWORDS:
-            if re.search(r"\b" + keyword + r"\b", query_lower):
-                return True
-
-        # Check category
-        if category and category.lower() in self.HIGH_FRESHNESS_CATEGORIES:
-            return True
-
-        # Check for dates (today, this week, etc.)
-        date_patterns = [
-            r"\btoday\b",
-            r"\bthis\s+(?:week|month|year)\b",
-            r"\b(?:this|last)\s+(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
-            r"\b\d{4}\b",  # Year
-        ]
-
-        for pattern in date_patterns:
-            if re.search(pattern, query_lower):
-                return True
-
-        return False
+        return _classify(query.lower(), (category or "").lower())[0]
 
     def get_refresh_interval(self, query: str, category: str | None = None) -> int:
         """
@@ -232,6 +323,80 @@ class RealTimeDataManager:
         query_type = self._classify_query_type(query, category)
         return self.REFRESH_INTERVALS.get(query_type, self.REFRESH_INTERVALS["regular"])
 
+    def cache_stats(self) -> dict[str, int]:
+        """
+        Get query classification cache statistics.
+
+        Returns:
+            Dict with hits, misses, maxsize and currsize
+        """
+        return _classify.cache_info()._asdict()
+
+    async def get_with_swr(
+        self,
+        query: str,
+        category: str | None,
+        fetcher: Callable[[], Awaitable[list[dict[str, Any]]]],
+    ) -> tuple[list[dict[str, Any]], str]:
+        """
+        Get results using stale-while-revalidate.
+
+        Cached results younger than the refresh interval are served as-is.
+        Older results within the stale_ok window are served immediately while
+        a background task refetches them. Anything else is fetched inline.
+
+        Args:
+            query: Search query
+            category: Optional category
+            fetcher: Coroutine function returning fresh results
+
+        Returns:
+            Tuple of (results, cache_state) where cache_state is
+            'fresh', 'stale' or 'miss'
+        """
+        key = self._cache_key(query, category)
+        cached = self.query_cache.get(key)
+
+        if cached is not None:
+            query_type = self._classify_query_type(query, category)
+            refresh_interval = self.REFRESH_INTERVALS.get(
+                query_type, self.REFRESH_INTERVALS["regular"]
+            )
+            stale_ok = self.STALE_OK_SECONDS.get(query_type, self.STALE_OK_SECONDS["regular"])
+            age = (datetime.utcnow() - self.refresh_timers[key]).total_seconds()
+
+            if age < refresh_interval:
+                return cached["results"], "fresh"
+
+            if age < stale_ok:
+                if key not in self._revalidating:
+                    self._revalidating[key] = asyncio.create_task(self._revalidate(key, fetcher))
+                return cached["results"], "stale"
+
+        results = await fetcher()
+        self._store(key, results)
+        return results, "miss"
+
+    async def _revalidate(
+        self, key: str, fetcher: Callable[[], Awaitable[list[dict[str, Any]]]]
+    ) -> None:
+        """Refetch a stale cache entry in the background."""
+        try:
+            self._store(key, await fetcher())
+        except Exception as e:
+            logger.warning(f"Background revalidation failed for {key}: {e}")
+        finally:
+            self._revalidating.pop(key, None)
+
+    def _store(self, key: str, results: list[dict[str, Any]]) -> None:
+        """Store results in the query cache."""
+        self.query_cache[key] = {"results": results}
+        self.refresh_timers[key] = datetime.utcnow()
+
+    def _cache_key(self, query: str, category: str | None) -> str:
+        """Build the query cache key."""
+        return f"{(category or '').lower()}:{query.strip().lower()}"
+
     def get_rtd_status(
         self, query: str, results: list[dict[str, Any]], category: str | None = None
     ) -> dict[str, Any]:
@@ -250,10 +415,7 @@ class RealTimeDataManager:
         refresh_interval = self.get_refresh_interval(query, category)
 
         # Calculate freshness for all results
-        freshness_scores = []
-        for result in results:
-            freshness = self.calculate_freshness(result)
-            freshness_scores.append(freshness)
+        freshness_scores = self.calculate_freshness_batch(results)
 
         # Calculate average freshness
         avg_score = 0
@@ -294,6 +456,17 @@ class RealTimeDataManager:
                 try:
                     # Try parsing ISO format
                     if isinstance(value, str):
+                        # Most engines emit ISO 8601, which parses without
+                        # walking the strptime formats below
+                        try:
+                            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+                        except ValueError:
+                            pass
+                        else:
+                            if parsed.tzinfo is not None:
+                                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+                            return parsed
+
                         # Handle various formats
                         for fmt in [
                             "%Y-%m-%dT%H:%M:%S.%fZ",
@@ -307,12 +480,6 @@ class RealTimeDataManager:
                             except ValueError:
                                 continue
 
-                        # Try ISO parse as fallback
-                        try:
-                            return datetime.fromisoformat(value.replace("Z", "+00:00"))
-                        except (ValueError, AttributeError):
-                            pass
-
                     elif isinstance(value, (int, float)):
                         # Unix timestamp
                         return datetime.fromtimestamp(value)
@@ -358,16 +525,7 @@ class RealTimeDataManager:
 
     def _get_badge_and_status(self, age_seconds: float) -> tuple[str, str]:
         """Get badge emoji and status string."""
-        if age_seconds < self.FRESHNESS_THRESHOLDS["live"]:
-            return "🔴 LIVE", "live"
-        elif age_seconds < self.FRESHNESS_THRESHOLDS["fresh"]:
-            return "🟢 FRESH", "fresh"
-        elif age_seconds < self.FRESHNESS_THRESHOLDS["recent"]:
-            return "🟡 RECENT", "recent"
-        elif age_seconds < self.FRESHNESS_THRESHOLDS["stale"]:
-            return "🟠 STALE", "stale"
-        else:
-            return "⚪ OLD", "old"
+        return FRESHNESS_BADGES[bisect_right(self._THRESHOLD_BOUNDS, age_seconds)]
 
     def _format_age(self, age_seconds: float) -> str:
         """Format age in human-readable form."""
@@ -406,51 +564,4 @@ class RealTimeDataManager:
 
         Returns: 'live', 'dynamic', 'regular', or 'static'
         """
-        query_lower = query.lower()
-
-        # Live data keywords
-        live_keywords = ["live", "real-time", "now", "current", "streaming", "score"]
-        for keyword in live_keywords:
-            if keyword in query_lower:
-                return "live"
-
-        # Dynamic content keywords
-        dynamic_keywords = [
-            "news",
-            "breaking",
-            "latest",
-            "update",
-            "trending",
-            "price",
-            "stock",
-            "weather",
-            "traffic",
-        ]
-        for keyword in dynamic_keywords:
-            if keyword in query_lower:
-                return "dynamic"
-
-        # Check category
-        if category:
-            cat_lower = category.lower()
-            if cat_lower in ["news", "social"]:
-                return "dynamic"
-            elif cat_lower in ["finance", "weather", "sports"]:
-                return "live"
-
-        # Historical/research queries = static
-        static_keywords = [
-            "history",
-            "definition",
-            "biography",
-            "meaning",
-            "what is",
-            "who is",
-            "who was",
-            "when was",
-        ]
-        for keyword in static_keywords:
-            if keyword in query_lower:
-                return "static"
-
-        return "regular"
+        return _classify(query.lower(), (category or "").lower())[1]
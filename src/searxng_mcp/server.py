@@ -19,6 +19,8 @@ import logging
 import os
 import threading
 import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from http.cookiejar import LWPCookieJar
 from pathlib import Path
 from typing import Any
@@ -28,6 +30,11 @@ import httpx  # type: ignore[import-not-found]
 from fastmcp import FastMCP  # type: ignore[import-not-found]
 from pydantic import Field  # type: ignore[import-not-found]
 
+try:
+    from orjson import loads as _loads  # type: ignore[import-not-found]
+except ImportError:
+    _loads = json.loads
+
 from searxng_mcp.cache import ResultCache
 from searxng_mcp.metrics import MetricsCollector
 
@@ -80,6 +87,8 @@ class InstanceManager:
         self.cookie_dir.mkdir(parents=True, exist_ok=True)
         self.cookie_jars: dict[str, LWPCookieJar] = {}
         self._init_cookie_jars()
+        # One keep-alive client per instance, created on first use
+        self._clients: dict[str, httpx.AsyncClient] = {}
 
     def _init_cookie_jars(self) -> None:
         """Initialize cookie jars for each instance."""
@@ -109,6 +118,23 @@ class InstanceManager:
             except Exception as e:
                 logger.warning(f"Failed to save cookies for {instance}: {e}")
 
+    def _get_client(self, instance: str) -> httpx.AsyncClient:
+        """Get the pooled HTTP client for an instance, creating it on first use."""
+        client = self._clients.get(instance)
+        if client is None:
+            client = httpx.AsyncClient(
+                follow_redirects=True,
+                cookies=self.cookie_jars.get(instance),
+            )
+            self._clients[instance] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close all pooled HTTP clients."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
     async def search(
         self,
         query: str,
@@ -179,28 +205,35 @@ class InstanceManager:
         url = urljoin(instance, "/search")
         jar = self.cookie_jars.get(instance)
 
-        async with httpx.AsyncClient(
-            timeout=timeout,
-            follow_redirects=True,
-            cookies=jar,
-        ) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
+        client = self._get_client(instance)
+        response = await client.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+
+        # Update cookies
+        if jar and response.cookies:
+            for cookie in response.cookies.jar:
+                jar.set_cookie(cookie)
+            self.save_cookies(instance)
 
-            # Update cookies
-            if jar and response.cookies:
-                for cookie in response.cookies.jar:
-                    jar.set_cookie(cookie)
-                self.save_cookies(instance)
+        data = _loads(response.content)
+        data["_instance"] = instance
+        logger.info(f"Search successful on {instance}: {len(data.get('results', []))} results")
+        return data
 
-            data = response.json()
-            data["_instance"] = instance
-            logger.info(f"Search successful on {instance}: {len(data.get('results', []))} results")
-            return data
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Lifespan handler that closes pooled HTTP clients on shutdown."""
+    yield
+    if instance_manager is not None:
+        await instance_manager.aclose()
+    from searxng_mcp.ai_enhancer import close_http_client
+
+    await close_http_client()
 
 
 # Initialize FastMCP server
-mcp = FastMCP("SearXNG Search")
+mcp = FastMCP("SearXNG Search", lifespan=lifespan)
 
 # Global instance manager
 instance_manager: InstanceManager | None = None
@@ -502,9 +535,20 @@ async def get_session_stats() -> str:
     return json.dumps(stats, indent=2)
 
 
+def _install_uvloop() -> None:
+    """Use uvloop's event loop for all asyncio loops when it is installed."""
+    try:
+        import uvloop  # type: ignore[import-not-found]
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("Using uvloop event loop")
+
+
 def main() -> None:
     """Run the MCP server."""
     logger.info("Starting SearXNG MCP server...")
+    _install_uvloop()
 
     # Initialize systems
     get_cache()
@@ -0,0 +1,56 @@
+"""
+Token Counting Helpers
+
+Two-stage token counting: a cheap character-based estimate for every message,
+and an exact tiktoken count reserved for when a budget decision depends on it.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def fast_estimate(text: str) -> int:
+    """Estimate token count (roughly 4 chars = 1 token)."""
+    return len(text) // 4
+
+
+@lru_cache(maxsize=1)
+def _get_encoding() -> Any:
+    """Load the tiktoken encoding once, or None if tiktoken is not installed."""
+    try:
+        import tiktoken  # type: ignore[import-not-found]
+    except ImportError:
+        logger.debug("tiktoken not available - exact counts fall back to estimates")
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def exact_count(text: str) -> int:
+    """
+    Count tokens exactly with tiktoken.
+
+    Falls back to fast_estimate() when tiktoken is not installed.
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return fast_estimate(text)
+    return len(encoding.encode(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to at most max_tokens tokens.
+
+    Falls back to the fast_estimate() ratio (4 chars per token) when tiktoken
+    is not installed.
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[: max_tokens * 4]
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
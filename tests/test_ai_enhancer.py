@@ -0,0 +1,137 @@
+"""Tests for the AI enhancer: batching, reply parsing, model and client caching."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from searxng_mcp import ai_enhancer
+from searxng_mcp.ai_enhancer import BATCH_SYSTEM_PROMPT, AIEnhancer
+
+
+class FakeEnhancer(AIEnhancer):
+    """Enhancer whose provider calls are answered locally."""
+
+    def __init__(self, fail_batch: bool = False):
+        super().__init__()
+        self.fail_batch = fail_batch
+        self.calls: list[str] = []
+
+    async def _call_provider(self, system_prompt, user_prompt):
+        self.calls.append(system_prompt)
+        if system_prompt == BATCH_SYSTEM_PROMPT:
+            if self.fail_batch:
+                raise ValueError("truncated JSON in batched reply")
+            count = user_prompt.count("=== Result set")
+            return {"items": [{"ai_summary": f"batched {i}"} for i in range(count)]}
+        return {"ai_summary": user_prompt.split("\n", 1)[0]}
+
+
+@pytest.fixture(autouse=True)
+def provider_env(monkeypatch):
+    monkeypatch.setenv("SEARXNG_AI_PROVIDER", "ollama")
+    monkeypatch.setenv("SEARXNG_AI_API_KEY", "test-key")
+    monkeypatch.setattr(ai_enhancer, "BATCH_WINDOW", 0.01)
+    monkeypatch.setattr(ai_enhancer, "BATCH_MAX_SIZE", 8)
+
+
+async def test_concurrent_enhancements_share_one_request():
+    enhancer = FakeEnhancer()
+    results = await asyncio.gather(
+        *(enhancer._generate_enhancement(f"q{i}", f"context {i}") for i in range(3))
+    )
+
+    assert enhancer.calls == [BATCH_SYSTEM_PROMPT]
+    assert [r["ai_summary"] for r in results] == ["batched 0", "batched 1", "batched 2"]
+
+
+async def test_failed_batch_falls_back_to_individual_calls():
+    enhancer = FakeEnhancer(fail_batch=True)
+    results = await asyncio.gather(
+        *(enhancer._generate_enhancement(f"q{i}", f"context {i}") for i in range(3))
+    )
+
+    assert enhancer.calls[0] == BATCH_SYSTEM_PROMPT
+    assert len(enhancer.calls) == 4
+    assert [r["ai_summary"] for r in results] == ["context 0", "context 1", "context 2"]
+
+
+async def test_without_a_window_each_enhancement_is_sent_alone(monkeypatch):
+    monkeypatch.setattr(ai_enhancer, "BATCH_WINDOW", 0)
+    enhancer = FakeEnhancer()
+    results = await asyncio.gather(
+        *(enhancer._generate_enhancement(f"q{i}", f"context {i}") for i in range(2))
+    )
+
+    assert BATCH_SYSTEM_PROMPT not in enhancer.calls
+    assert [r["ai_summary"] for r in results] == ["context 0", "context 1"]
+
+
+def test_gemini_model_cache_is_keyed_by_api_key(tmp_path, monkeypatch):
+    cache_file = tmp_path / "gemini_model.json"
+    monkeypatch.setattr(ai_enhancer, "GEMINI_MODEL_CACHE_FILE", cache_file)
+
+    ai_enhancer._save_cached_gemini_model("key-a", "gemini-3-flash")
+    ai_enhancer._save_cached_gemini_model("key-b", "gemini-2.5-flash")
+
+    assert ai_enhancer._load_cached_gemini_model("key-a") == "gemini-3-flash"
+    assert ai_enhancer._load_cached_gemini_model("key-b") == "gemini-2.5-flash"
+    assert ai_enhancer._load_cached_gemini_model("key-c") is None
+    assert b"key-a" not in cache_file.read_bytes()
+
+    monkeypatch.setattr(ai_enhancer, "GEMINI_MODEL_CACHE_TTL", -1)
+    assert ai_enhancer._load_cached_gemini_model("key-a") is None
+
+
+def test_closed_fields_yields_each_field_once_as_it_completes():
+    reply = '{"ai_summary": "Short, with {braces}", "key_insights": ["a", "b"], "confidence": 0.9}'
+    buffer, pos, fields = "", 0, []
+    for end in range(1, len(reply) + 1):
+        buffer = reply[:end]
+        completed, pos = ai_enhancer._closed_fields(buffer, pos)
+        fields.extend(completed)
+        if end < reply.index(', "key_insights"'):
+            assert fields == []
+
+    assert fields == [
+        ("ai_summary", "Short, with {braces}"),
+        ("key_insights", ["a", "b"]),
+        ("confidence", 0.9),
+    ]
+
+
+class FakeAsyncClient:
+    """Stands in for httpx.AsyncClient."""
+
+    def __init__(self, **kwargs):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_http_client_is_bound_to_the_running_loop(monkeypatch):
+    fake_httpx = SimpleNamespace(AsyncClient=FakeAsyncClient, Limits=lambda **kwargs: None)
+    monkeypatch.setattr(ai_enhancer, "httpx", fake_httpx)
+    monkeypatch.setattr(ai_enhancer, "aiohttp", None)
+    monkeypatch.setattr(ai_enhancer, "_http_clients", {})
+
+    async def get_twice():
+        return await ai_enhancer._get_http_client(), await ai_enhancer._get_http_client()
+
+    first, again = asyncio.run(get_twice())
+    assert first is again
+
+    # A later asyncio.run() gets a fresh client, and the closed loop's is dropped
+    second, _ = asyncio.run(get_twice())
+    assert second is not first
+    assert list(ai_enhancer._http_clients.values()) == [second]
+
+    async def get_and_close():
+        client = await ai_enhancer._get_http_client()
+        await ai_enhancer.close_http_client()
+        return client
+
+    closed = asyncio.run(get_and_close())
+    assert closed.closed
+    assert closed not in ai_enhancer._http_clients.values()
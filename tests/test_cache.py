@@ -0,0 +1,79 @@
+"""Tests for the log-structured ResultCache."""
+
+from searxng_mcp import cache as cache_module
+from searxng_mcp.cache import LOG_FILENAME, ResultCache
+
+
+def test_round_trip_survives_reopen(tmp_path):
+    cache = ResultCache(tmp_path)
+    assert cache.set({"results": [{"title": "héllo"}]}, "python", categories="general")
+    assert cache.get("python", categories="general") == {"results": [{"title": "héllo"}]}
+    assert cache.get("python", categories="news") is None
+    cache.close()
+
+    reopened = ResultCache(tmp_path)
+    assert reopened.get("python", categories="general") == {"results": [{"title": "héllo"}]}
+    reopened.close()
+
+
+def test_compaction_drops_overwritten_frames(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "COMPACT_MIN_BYTES", 1)
+    cache = ResultCache(tmp_path)
+    for version in range(20):
+        cache.set({"version": version, "padding": "x" * 100}, "same query")
+    cache.set({"version": "other"}, "other query")
+
+    assert (tmp_path / LOG_FILENAME).stat().st_size < 3 * 200
+    assert cache.get("same query")["version"] == 19
+    cache.close()
+
+    reopened = ResultCache(tmp_path)
+    assert reopened.get("same query")["version"] == 19
+    assert reopened.get("other query") == {"version": "other"}
+    reopened.close()
+
+
+def test_torn_tail_is_truncated_on_load(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.set({"value": 1}, "first")
+    cache.close()
+    log_path = tmp_path / LOG_FILENAME
+    intact_size = log_path.stat().st_size
+    with open(log_path, "ab") as log:
+        log.write(b"\x00\x00\x01\x00partial")
+
+    reopened = ResultCache(tmp_path)
+    assert log_path.stat().st_size == intact_size
+    assert reopened.get("first") == {"value": 1}
+    reopened.set({"value": 2}, "second")
+    reopened.close()
+
+    assert ResultCache(tmp_path).get("second") == {"value": 2}
+
+
+def test_processes_sharing_a_directory_see_each_other(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "COMPACT_MIN_BYTES", 1)
+    first = ResultCache(tmp_path)
+    second = ResultCache(tmp_path)
+
+    first.set({"from": "first"}, "shared")
+    assert second.get("shared") == {"from": "first"}
+
+    # second compacts (replacing the log file); first must not write to the old one
+    for version in range(5):
+        second.set({"version": version}, "churn")
+    first.set({"from": "first", "after": "compaction"}, "late")
+
+    third = ResultCache(tmp_path)
+    assert third.get("late") == {"from": "first", "after": "compaction"}
+    assert third.get("churn") == {"version": 4}
+    assert third.get("shared") == {"from": "first"}
+
+
+def test_legacy_entries_are_removed_on_load(tmp_path):
+    (tmp_path / "0123abcd.json").write_text('{"data": {}}')
+
+    cache = ResultCache(tmp_path)
+
+    assert not (tmp_path / "0123abcd.json").exists()
+    cache.close()
@@ -0,0 +1,34 @@
+"""Tests for environment configuration loading."""
+
+import pytest
+
+from searxng_mcp import config
+from searxng_mcp.config import get_config
+
+
+@pytest.fixture(autouse=True)
+def fresh_config():
+    config._load_config.cache_clear()
+    yield
+    config._load_config.cache_clear()
+
+
+def test_callers_get_independent_copies():
+    first = get_config()
+    first["timeout"] = 1.0
+    first["instances"].append("https://example.invalid")
+
+    second = get_config()
+    assert second["timeout"] == 5.0
+    assert "https://example.invalid" not in second["instances"]
+
+
+def test_environment_is_cached_until_cleared(monkeypatch):
+    monkeypatch.setenv("SEARXNG_TIMEOUT", "7.5")
+    assert get_config()["timeout"] == 7.5
+
+    monkeypatch.setenv("SEARXNG_TIMEOUT", "9")
+    assert get_config()["timeout"] == 7.5
+
+    config._load_config.cache_clear()
+    assert get_config()["timeout"] == 9.0
@@ -0,0 +1,135 @@
+"""Tests for InfiniteContextManager fact extraction and windowing."""
+
+from searxng_mcp.context_manager import InfiniteContextManager
+
+CONVERSATION = [
+    ("user", "Python is a popular programming language. What makes it fast?"),
+    ("assistant", "CPython has a bytecode interpreter written in C. PyPy uses a JIT compiler!"),
+    ("user", "Rust was designed for memory safety without garbage collection"),
+    ("assistant", "The borrow checker enforces ownership rules at compile time."),
+]
+
+
+def test_bulk_and_per_message_extraction_agree():
+    single = InfiniteContextManager()
+    for role, content in CONVERSATION:
+        single.add_message(role, content)
+
+    bulk = InfiniteContextManager()
+    bulk.add_messages_bulk(CONVERSATION)
+
+    def pairs(manager):
+        return [(fact["role"], fact["fact"]) for fact in manager.key_facts]
+
+    assert pairs(bulk) == pairs(single)
+    assert ("user", "Rust was designed for memory safety without garbage collection") in pairs(bulk)
+    assert bulk.entities == single.entities
+
+
+def turn(index: int) -> tuple[str, str]:
+    """A ten-token (by the fast estimate) message, alternating user/assistant."""
+    role = "user" if index % 2 == 0 else "assistant"
+    return role, f"{index:03d} " + "word " * 7 + "end"
+
+
+def add_turns(manager, count):
+    """Add count turns, yielding after each one that slid the window."""
+    for index in range(count):
+        blocks = manager.total_messages - len(manager.messages) - len(manager._pinned)
+        manager.add_message(*turn(index))
+        if manager.total_messages - len(manager.messages) - len(manager._pinned) > blocks:
+            yield index
+
+
+def test_token_window_slides_down_to_target():
+    manager = InfiniteContextManager(trigger_tokens=100, target_tokens=50)
+
+    slides = list(add_turns(manager, 40))
+
+    assert slides
+    assert manager.compressed_blocks
+    assert manager.token_count < manager.trigger_tokens
+
+
+def test_token_window_starts_on_a_user_turn_after_sliding():
+    manager = InfiniteContextManager(trigger_tokens=100, target_tokens=50)
+
+    for _ in add_turns(manager, 40):
+        assert manager._fast_total <= manager.target_tokens
+        assert manager.messages[0]["role"] == "user"
+
+
+def test_token_window_keeps_pinned_system_messages():
+    manager = InfiniteContextManager(trigger_tokens=100, target_tokens=50)
+    manager.add_message("system", "You are a helpful research assistant.")
+
+    assert list(add_turns(manager, 40))
+    recent = manager.get_context()["recent_messages"]
+    assert recent[0]["content"] == "You are a helpful research assistant."
+    assert all(m["role"] != "system" for m in manager.messages)
+    assert manager.get_stats()["pinned_messages"] == 1
+
+
+def test_message_count_window_is_used_without_trigger_tokens():
+    manager = InfiniteContextManager(recent_messages_limit=10, compression_threshold=15)
+    manager.add_message("system", "You are a helpful research assistant.")
+    for index in range(14):
+        manager.add_message(*turn(index))
+
+    # 15 messages: still at the threshold, nothing compressed or pinned
+    assert len(manager.messages) == 15
+    assert not manager.compressed_blocks
+    assert not manager._pinned
+
+    manager.add_message(*turn(14))
+
+    assert len(manager.messages) == 10
+    assert manager.messages[0]["content"] == turn(5)[1]
+    assert manager.compressed_blocks
+    assert len(manager.get_context()["recent_messages"]) == 10
+
+
+def span(intent: str, facts: list[str]) -> dict:
+    """A span summary as produced by _summarize_span."""
+    return {"intent": intent, "facts": facts, "entities": {}, "decisions": [], "next_steps": []}
+
+
+def test_anchor_keeps_first_intent_and_dedupes_facts():
+    manager = InfiniteContextManager()
+    manager._merge_anchor(span("Compare Python and Rust", ["Python is dynamically typed."]))
+    manager._merge_anchor(
+        span("Something else", ["PYTHON IS DYNAMICALLY TYPED.", "Rust has no garbage collector."])
+    )
+
+    anchor = manager.get_anchor()
+    assert anchor["intent"] == "Compare Python and Rust"
+    assert anchor["facts"] == ["Python is dynamically typed.", "Rust has no garbage collector."]
+
+
+def test_anchor_dedupe_set_follows_trimmed_facts():
+    manager = InfiniteContextManager()
+    manager._merge_anchor(span("intent", ["Fact number 0 is retained."]))
+    for index in range(1, 60):
+        manager._merge_anchor(span("intent", [f"Fact number {index} is retained."]))
+
+    assert len(manager.get_anchor()["facts"]) == 20
+    assert len(manager._anchor_fact_hashes) == 20
+
+    # A fact trimmed from the anchor can come back
+    manager._merge_anchor(span("intent", ["Fact number 0 is retained."]))
+    assert manager.get_anchor()["facts"][-1] == "Fact number 0 is retained."
+
+
+def test_stats_compare_original_and_current_with_one_estimator(monkeypatch):
+    from searxng_mcp import context_manager
+
+    # An exact tokenizer that counts a few more tokens than the fast estimate
+    monkeypatch.setattr(context_manager, "exact_count", lambda text: len(text) // 4 + 2)
+    manager = InfiniteContextManager(trigger_tokens=220, target_tokens=110)
+    for index in range(20):
+        manager.add_message(*turn(index))
+
+    stats = manager.get_stats()
+    assert stats["current_tokens"] > stats["original_tokens"]
+    assert stats["tokens_saved"] == stats["original_tokens"] - stats["fast_estimate"] == 0
+    assert stats["compression_ratio"] == 0.0
@@ -0,0 +1,119 @@
+"""Tests for the REPL code whitelist and message search."""
+
+import pytest
+
+from searxng_mcp.repl_manager import REPLSecurityError, RLMREPLManager, _parse_and_check
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        'def exec(): pass\nexec("print(1)")',
+        'def open(): pass\nopen("/etc/passwd")',
+        'class eval: pass\neval("1")',
+        'len = exec\nlen("print(1)")',
+        'def f(len):\n    return len("print(1)")\nf(exec)',
+        'def f(): pass\nf = exec\nf("print(1)")',
+        'for len in [exec]:\n    len("print(1)")',
+        '(len := exec)("print(1)")',
+        "def g():\n    def h(): pass\n    return h()",
+        "import os",
+        "().__class__",
+        # Builtins reached without calling them by name
+        'result = [eval][0]("1+1")',
+        'result = {"f": open}["f"]("/etc/hostname").read()',
+        "f = getattr",
+        # Calls through anything but a whitelisted name or a method
+        "result = (lambda: 1)()",
+        "result = [len][0]([])",
+        "result = sorted(())()",
+        # Frame attributes leading back to real globals and builtins
+        'def g():\n    yield 1\nresult = g().gi_frame.f_globals["__builtins__"]',
+        "def g():\n    yield 1\nframe = g().gi_frame",
+        "result = context.f_back",
+        "result = context.cr_frame",
+    ],
+)
+def test_unsafe_code_is_rejected(code):
+    with pytest.raises(REPLSecurityError):
+        _parse_and_check(code)
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "result = count_messages()",
+        "def helper(items):\n    return len(items)\nresult = helper([1, 2])",
+        "positions = [i for i in range(3)]\nresult = sum(positions)",
+        'result = [m["content"].lower() for m in context["messages"]]',
+    ],
+)
+def test_safe_code_is_accepted(code):
+    _parse_and_check(code)
+
+
+def test_execute_code_reports_shadowed_builtin():
+    manager = RLMREPLManager()
+    outcome = manager.execute_code('def exec(): pass\nexec("result = 1")')
+
+    assert outcome["status"] == "error"
+    assert outcome["error_type"] == "REPLSecurityError"
+
+
+def test_fallback_execution_only_exposes_whitelisted_builtins():
+    manager = RLMREPLManager()
+
+    assert manager._execute_fallback(compile("result = abs(-1)", "<string>", "exec")) == 1
+    with pytest.raises(NameError):
+        manager._execute_fallback(compile("result = open", "<string>", "exec"))
+
+
+CONVERSATION = [
+    ("user", "What is quantum computing?"),
+    ("assistant", "Quantum computing uses superposition, unlike classical computers."),
+    ("user", "How does it differ from classical computing?"),
+    ("assistant", "Classical computers use bits, while quantum computers use qubits."),
+    ("user", "What are some applications?"),
+    ("assistant", "Cryptography, drug discovery, machine learning and quantum simulation."),
+    ("user", "Straſſe and İstanbul are spelled with non-ASCII letters"),
+]
+
+
+@pytest.fixture
+def manager():
+    manager = RLMREPLManager()
+    for role, content in CONVERSATION:
+        manager.add_message(role, content)
+    return manager
+
+
+@pytest.mark.parametrize(
+    ("keyword", "expected_ids"),
+    [
+        ("comput", [0, 1, 2, 3]),
+        ("quantum comp", [0, 1, 3]),
+        ("learn", [5]),
+        ("qubit", [3]),
+        ("CLASSICAL", [1, 2, 3]),
+        ("ss", [1, 2, 3, 6]),
+        ("istanbul", [6]),
+        ("quantum  computing", []),
+        ("comput(ers|ing)\\?", [0, 2]),
+    ],
+)
+def test_find_messages_matches_substrings_like_a_full_scan(manager, keyword, expected_ids):
+    assert [msg["id"] for msg in manager._find_messages(keyword)] == expected_ids
+
+
+@pytest.mark.parametrize(
+    ("query", "top_k", "expected_ids"),
+    [
+        ("qubit computing", 10, [0, 1, 2, 3]),
+        ("quantum comput", 10, [0, 1, 3, 2, 5]),
+        ("quantum comput", 2, [0, 1]),
+        ("computing?", 10, [0, 2]),
+        ("xyz", 10, []),
+    ],
+)
+def test_search_semantic_scores_substrings_like_a_full_scan(manager, query, top_k, expected_ids):
+    assert [msg["id"] for msg in manager._search_semantic(query, top_k)] == expected_ids